@@ -40,21 +40,36 @@ All admin commands
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import re
-from datetime import datetime, timedelta
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache, wraps
 from typing import TYPE_CHECKING
 
-from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
+from telegram import (
+    BotCommand,
+    BotCommandScopeChat,
+    InlineKeyboardButton,
+    InlineKeyboardMarkup,
+    Message,
+    MessageOriginChannel,
+    Update,
+)
 from telegram.constants import ParseMode
+from telegram.error import TelegramError
 from telegram.ext import (
     CallbackQueryHandler,
-    CommandHandler,
     ContextTypes,
+    Job,
+    JobQueue,
     MessageHandler,
     filters,
 )
 
+from publisher import is_transient, prefetch_message, publish_message, retry_delay
+
 if TYPE_CHECKING:
     from database import Database
     from config import Config
@@ -65,58 +80,115 @@ logger = logging.getLogger(__name__)
 # Auth guard
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _is_admin(user_id: int, cfg: "Config", db: "Database") -> bool:
-    return user_id in cfg.admin_ids or user_id in db.extra_admins()
+def _admin_set(bot_data: dict) -> frozenset[int]:
+    """
+    Config admins ∪ DB admins, built lazily and kept in bot_data.
+    /addadmin and /removeadmin drop it so the next check rebuilds it.
+    """
+    admins = bot_data.get("_admin_set")
+    if admins is None:
+        cfg: Config   = bot_data["config"]
+        db:  Database = bot_data["db"]
+        admins = cfg.admin_ids | db.extra_admin_set()
+        bot_data["_admin_set"] = admins
+    return admins
+
+
+_DENY_NOTICE_EVERY = 3600   # seconds between "Admin only" replies to one user
 
 
 def _admin_only(func):
-    """Decorator: silently ignore non-admin users."""
+    """
+    Decorator: ignore non-admin users.  Each one gets the "Admin only"
+    notice at most once per _DENY_NOTICE_EVERY, so spamming commands at the
+    bot cannot make it spend API calls on replies.
+    """
+    @wraps(func)
     async def wrapper(update: Update, context: ContextTypes.DEFAULT_TYPE):
-        uid = update.effective_user.id if update.effective_user else 0
-        cfg: Config   = context.bot_data["config"]
-        db:  Database = context.bot_data["db"]
-        if not _is_admin(uid, cfg, db):
-            await update.effective_message.reply_text("⛔ Admin only.")
+        user = update.effective_user
+        if user is None or user.id not in _admin_set(context.bot_data):
+            denied: dict[int, float] = context.bot_data.setdefault("_denied", {})
+            now = time.monotonic()
+            if user is not None and now - denied.get(user.id, -_DENY_NOTICE_EVERY) >= _DENY_NOTICE_EVERY:
+                # Keep the dict oldest-first and drop entries whose window
+                # has passed, so it only holds recently denied users
+                denied.pop(user.id, None)
+                while denied:
+                    oldest = next(iter(denied))
+                    if now - denied[oldest] < _DENY_NOTICE_EVERY:
+                        break
+                    del denied[oldest]
+                denied[user.id] = now
+                if update.effective_message:
+                    await update.effective_message.reply_text("⛔ Admin only.")
+            else:
+                logger.debug("Dropped non-admin update from %s", user.id if user else None)
             return
         return await func(update, context)
-    wrapper.__name__ = func.__name__
     return wrapper
 
 
+def _arg_text(context: ContextTypes.DEFAULT_TYPE) -> str:
+    """Command arguments as one string (PTB already splits on whitespace)."""
+    args = context.args
+    if not args:
+        return ""
+    if len(args) == 1:
+        return args[0]
+    return " ".join(args)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Interval parser
 # ─────────────────────────────────────────────────────────────────────────────
 
+_UNIT_SECONDS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+_UNIT_SECONDS.update({u.upper(): n for u, n in _UNIT_SECONDS.items()})
+
+# group 1 = private channel number (t.me/c/…), group 2 = public username
+_TME_LINK_RE = re.compile(r"t\.me/(?:c/(\d+)|([A-Za-z0-9_]+))/(\d+)")
+
+
 def parse_interval(text: str) -> int | None:
     """
     Parse human interval string → seconds.
     Examples: "10m", "2h", "30s", "1h30m", "90"
     Returns None if unparseable.
+
+    Single forward scan: each run of digits is read as a number, optional
+    whitespace is skipped, and a trailing s/m/h/d picks the multiplier
+    (bare numbers are seconds).  Any other character is ignored, so the
+    text needs no strip()/lower() copy first.
     """
-    text = text.strip().lower()
     total = 0
-    pattern = re.findall(r"(\d+)\s*([smhd]?)", text)
-    if not pattern:
-        return None
-    for value, unit in pattern:
-        n = int(value)
-        if unit in ("", "s"):
+    i, end = 0, len(text)
+    while i < end:
+        c = text[i]
+        if not ("0" <= c <= "9"):
+            i += 1
+            continue
+        n = 0
+        while i < end and "0" <= text[i] <= "9":
+            n = n * 10 + (ord(text[i]) - 48)
+            i += 1
+        j = i
+        while j < end and text[j].isspace():
+            j += 1
+        mult = _UNIT_SECONDS.get(text[j]) if j < end else None
+        if mult is not None:
+            total += n * mult
+            i = j + 1
+        else:
             total += n
-        elif unit == "m":
-            total += n * 60
-        elif unit == "h":
-            total += n * 3600
-        elif unit == "d":
-            total += n * 86400
     return total if total > 0 else None
 
 
+@lru_cache(maxsize=64)
 def fmt_interval(seconds: int) -> str:
     """Pretty-print seconds as "Xh Ym Zs"."""
-    td = timedelta(seconds=seconds)
-    h, rem = divmod(td.seconds, 3600)
+    d, rem = divmod(seconds, 86400)
+    h, rem = divmod(rem, 3600)
     m, s   = divmod(rem, 60)
-    d      = td.days
     parts  = []
     if d: parts.append(f"{d}d")
     if h: parts.append(f"{h}h")
@@ -138,91 +210,124 @@ def parse_tme_link(text: str) -> tuple[int, int] | None:
       https://t.me/ChannelUsername/99        → public channel (username stored as str)
       https://t.me/channelname/thread/99     → topic (skipped for now)
     """
-    m = re.search(r"t\.me/c/(\d+)/(\d+)", text)
-    if m:
-        chat_id  = -1000000000000 - int(m.group(1))   # reconstruct -100… ID
-        msg_id   = int(m.group(2))
-        return chat_id, msg_id
+    m = _TME_LINK_RE.search(text)
+    if not m:
+        return None
 
-    m = re.search(r"t\.me/([A-Za-z0-9_]+)/(\d+)", text)
-    if m:
-        username = "@" + m.group(1)
-        msg_id   = int(m.group(2))
-        # Return username as a sentinel — caller resolves it
-        return username, msg_id  # type: ignore[return-value]
+    private, username, msg_id = m.groups()
+    if private is not None:
+        chat_id  = -1000000000000 - int(private)   # reconstruct -100… ID
+        return chat_id, int(msg_id)
 
-    return None
+    # Return username as a sentinel — caller resolves it
+    return "@" + username, int(msg_id)  # type: ignore[return-value]
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Dashboard keyboard
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _main_keyboard(db: Database) -> InlineKeyboardMarkup:
-    paused = db.get_bool("paused", False)
-    autolive = db.get_bool("auto_forward", False)
-
-    pause_btn = InlineKeyboardButton("▶️ Resume Queue", callback_data="cb_resume") if paused else InlineKeyboardButton("⏸ Pause Queue", callback_data="cb_pause")
-    autolive_btn = InlineKeyboardButton("🔴 AutoLive: OFF", callback_data="cb_autolive_toggle") if not autolive else InlineKeyboardButton("🟢 AutoLive: ON", callback_data="cb_autolive_toggle")
-
-    return InlineKeyboardMarkup([
-        [
-            InlineKeyboardButton("📊 Status",    callback_data="cb_status"),
-            InlineKeyboardButton("📈 Stats",     callback_data="cb_stats"),
-        ],
-        [
-            pause_btn,
-            autolive_btn,
-        ],
-        [
-            InlineKeyboardButton("⏭ Skip Next",  callback_data="cb_skip"),
-            InlineKeyboardButton("🧪 Test Post",  callback_data="cb_testpost"),
-        ],
-        [
-            InlineKeyboardButton("🔗 Channels",  callback_data="cb_channels"),
-            InlineKeyboardButton("🏷 Tags",       callback_data="cb_tags"),
-            InlineKeyboardButton("🛡 Filters",    callback_data="cb_filters"),
-        ],
-        [
-            InlineKeyboardButton("❓ Help",       callback_data="cb_help"),
-        ],
-    ])
+# Every button except the pause/autolive toggles is fixed, so those rows are
+# built once at import and shared by every keyboard we hand out.
+_KB_TOP_ROW = (
+    InlineKeyboardButton("📊 Status",    callback_data="cb_status"),
+    InlineKeyboardButton("📈 Stats",     callback_data="cb_stats"),
+)
+_KB_BOTTOM_ROWS = (
+    (
+        InlineKeyboardButton("⏭ Skip Next",  callback_data="cb_skip"),
+        InlineKeyboardButton("🧪 Test Post",  callback_data="cb_testpost"),
+    ),
+    (
+        InlineKeyboardButton("🔗 Channels",  callback_data="cb_channels"),
+        InlineKeyboardButton("🏷 Tags",       callback_data="cb_tags"),
+        InlineKeyboardButton("🛡 Filters",    callback_data="cb_filters"),
+    ),
+    (
+        InlineKeyboardButton("❓ Help",       callback_data="cb_help"),
+    ),
+)
+_BTN_RESUME       = InlineKeyboardButton("▶️ Resume Queue", callback_data="cb_resume")
+_BTN_PAUSE        = InlineKeyboardButton("⏸ Pause Queue", callback_data="cb_pause")
+_BTN_AUTOLIVE_ON  = InlineKeyboardButton("🟢 AutoLive: ON", callback_data="cb_autolive_toggle")
+_BTN_AUTOLIVE_OFF = InlineKeyboardButton("🔴 AutoLive: OFF", callback_data="cb_autolive_toggle")
+
+
+# Only (paused, autolive) varies, so there are just four possible markups.
+_KEYBOARDS: dict[tuple[bool, bool], InlineKeyboardMarkup] = {}
+
+
+def _main_keyboard(bot_data: dict) -> InlineKeyboardMarkup:
+    key = (_is_paused(bot_data), _is_autolive(bot_data))
+    markup = _KEYBOARDS.get(key)
+    if markup is None:
+        paused, autolive = key
+        pause_btn    = _BTN_RESUME if paused else _BTN_PAUSE
+        autolive_btn = _BTN_AUTOLIVE_ON if autolive else _BTN_AUTOLIVE_OFF
+        markup = _KEYBOARDS[key] = InlineKeyboardMarkup((
+            _KB_TOP_ROW,
+            (pause_btn, autolive_btn),
+            *_KB_BOTTOM_ROWS,
+        ))
+    return markup
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # /start — main dashboard
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Settings read by the dashboard views, fetched in one query per command.
+_DASHBOARD_KEYS = (
+    "interval_seconds",
+    "source_channel_id",
+    "target_channel_id",
+    "current_msg_id",
+    "start_msg_id",
+    "custom_tag",
+)
+
+START_TEXT = (
+    "🎬  <b>Movie Publisher Bot — Admin Panel</b>\n\n"
+    "<blockquote>"
+    "<b>Queue Status :</b>  {status_icon}\n"
+    "<b>Auto-Live  :</b>  {live_icon}\n"
+    "<b>Source     :</b>  <code>{src}</code>\n"
+    "<b>Target     :</b>  <code>{tgt}</code>\n"
+    "<b>Interval   :</b>  <code>{interval}</code>\n"
+    "<b>Pointer    :</b>  msg_id <code>{ptr}</code>\n"
+    "<b>Posted     :</b>  <code>{posted}</code> files"
+    "</blockquote>\n"
+    "<i>Use the buttons below to control the bot.</i>"
+)
+
+
 @_admin_only
 async def cmd_start(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     db: Database = context.bot_data["db"]
     cfg: Config  = context.bot_data["config"]
 
-    paused   = db.get_bool("paused", False)
-    autolive = db.get_bool("auto_forward", False)
-    interval = db.get_int("interval_seconds", 600)
-    src      = db.get("source_channel_id") or str(cfg.source_channel_id)
-    tgt      = db.get("target_channel_id") or str(cfg.target_channel_id)
-    ptr      = db.get_int("current_msg_id", 0)
+    vals     = db.multi_get(_DASHBOARD_KEYS)
+    paused   = _is_paused(context.bot_data)
+    autolive = _is_autolive(context.bot_data)
+    interval = db.parse_int(vals.get("interval_seconds"), 600)
+    src      = vals.get("source_channel_id") or str(cfg.source_channel_id)
+    tgt      = vals.get("target_channel_id") or str(cfg.target_channel_id)
+    ptr      = db.parse_int(vals.get("current_msg_id"), 0)
     posted   = db.total_posted()
 
     status_icon = "⏸ PAUSED" if paused else "▶️ RUNNING"
     live_icon   = "🟢 ON" if autolive else "🔴 OFF"
 
-    text = (
-        "🎬  <b>Movie Publisher Bot — Admin Panel</b>\n\n"
-        "<blockquote>"
-        f"<b>Queue Status :</b>  {status_icon}\n"
-        f"<b>Auto-Live  :</b>  {live_icon}\n"
-        f"<b>Source     :</b>  <code>{src}</code>\n"
-        f"<b>Target     :</b>  <code>{tgt}</code>\n"
-        f"<b>Interval   :</b>  <code>{fmt_interval(interval)}</code>\n"
-        f"<b>Pointer    :</b>  msg_id <code>{ptr}</code>\n"
-        f"<b>Posted     :</b>  <code>{posted}</code> files"
-        "</blockquote>\n"
-        "<i>Use the buttons below to control the bot.</i>"
+    text = START_TEXT.format(
+        status_icon=status_icon,
+        live_icon=live_icon,
+        src=src,
+        tgt=tgt,
+        interval=fmt_interval(interval),
+        ptr=ptr,
+        posted=posted,
     )
-    await update.message.reply_text(text, parse_mode=ParseMode.HTML, reply_markup=_main_keyboard(db))
+    await update.message.reply_text(text, parse_mode=ParseMode.HTML, reply_markup=_main_keyboard(context.bot_data))
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -254,12 +359,12 @@ HELP_TEXT = (
     "<b>Caption & Tags</b>\n"
     "/settag ⚡ Powered by @Chan  — Set footer tag\n"
     "/cleartag   — Remove footer tag\n"
-    "/addtag <text>   — Add extra tag line\n"
-    "/removetag <text>— Remove a tag line\n"
+    "/addtag &lt;text&gt;   — Add extra tag line\n"
+    "/removetag &lt;text&gt;— Remove a tag line\n"
     "/tags       — List all tags\n\n"
     "<b>Filters</b>\n"
-    "/addfilter <word>  — Block messages containing this word\n"
-    "/removefilter <word> — Unblock a word\n"
+    "/addfilter &lt;word&gt;[, …]  — Block messages containing these words\n"
+    "/removefilter &lt;word&gt; — Unblock a word\n"
     "/filters    — List all active filters\n\n"
     "<b>Admin Management</b>\n"
     "/addadmin 123456   — Grant admin\n"
@@ -280,44 +385,60 @@ async def cmd_help(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 # /status
 # ─────────────────────────────────────────────────────────────────────────────
 
+STATUS_TEXT = (
+    "📊  <b>Full Bot Status</b>\n\n"
+    "<blockquote>"
+    "<b>Queue State:</b> {state}\n"
+    "<b>Auto-Live  :</b> {live}\n"
+    "<b>Source     :</b> <code>{src}</code>\n"
+    "<b>Target     :</b> <code>{tgt}</code>\n"
+    "<b>Interval   :</b> <code>{interval}</code>\n"
+    "<b>Start msg  :</b> <code>{start_id}</code>\n"
+    "<b>Current ptr:</b> <code>{ptr}</code>\n"
+    "<b>Total posts:</b> <code>{posted}</code>\n"
+    "<b>Last post  :</b> <code>{last}</code>\n"
+    "<b>Active Fltrs:</b> {n_filters}\n"
+    "<b>Footer tag :</b> {tag}\n"
+    "<b>Extra tags :</b>\n{extra}"
+    "</blockquote>"
+)
+
+
 @_admin_only
 async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     db: Database  = context.bot_data["db"]
     cfg: Config   = context.bot_data["config"]
 
-    paused   = db.get_bool("paused", False)
-    autolive = db.get_bool("auto_forward", False)
-    interval = db.get_int("interval_seconds", 600)
-    src      = db.get("source_channel_id") or str(cfg.source_channel_id)
-    tgt      = db.get("target_channel_id") or str(cfg.target_channel_id)
-    ptr      = db.get_int("current_msg_id", 0)
-    start_id = db.get_int("start_msg_id", 0)
-    posted   = db.total_posted()
-    last     = db.last_post_time() or "Never"
-    tag      = db.get("custom_tag", "")
-    extra    = [t for t in (db.get("extra_tags") or "").split("|||") if t]
+    vals     = db.multi_get(_DASHBOARD_KEYS)
+    paused   = _is_paused(context.bot_data)
+    autolive = _is_autolive(context.bot_data)
+    interval = db.parse_int(vals.get("interval_seconds"), 600)
+    src      = vals.get("source_channel_id") or str(cfg.source_channel_id)
+    tgt      = vals.get("target_channel_id") or str(cfg.target_channel_id)
+    ptr      = db.parse_int(vals.get("current_msg_id"), 0)
+    start_id = db.parse_int(vals.get("start_msg_id"), 0)
+    posted, last = db.post_summary()
+    last     = last or "Never"
+    tag      = vals.get("custom_tag", "")
     filters_lst = db.get_filters()
 
     tag_display  = tag if tag else "<i>none</i>"
-    extra_display = "\n".join(f"  • {t}" for t in extra) if extra else "  <i>none</i>"
+    extra_display = _extra_tags_html(context.bot_data)[0]
     filter_display = "\n".join(f"  • {f}" for f in filters_lst) if filters_lst else "  <i>none</i>"
 
-    text = (
-        "📊  <b>Full Bot Status</b>\n\n"
-        "<blockquote>"
-        f"<b>Queue State:</b> {'⏸ PAUSED' if paused else '▶️ RUNNING'}\n"
-        f"<b>Auto-Live  :</b> {'🟢 ON' if autolive else '🔴 OFF'}\n"
-        f"<b>Source     :</b> <code>{src}</code>\n"
-        f"<b>Target     :</b> <code>{tgt}</code>\n"
-        f"<b>Interval   :</b> <code>{fmt_interval(interval)}</code>\n"
-        f"<b>Start msg  :</b> <code>{start_id}</code>\n"
-        f"<b>Current ptr:</b> <code>{ptr}</code>\n"
-        f"<b>Total posts:</b> <code>{posted}</code>\n"
-        f"<b>Last post  :</b> <code>{last}</code>\n"
-        f"<b>Active Fltrs:</b> {len(filters_lst)}\n"
-        f"<b>Footer tag :</b> {tag_display}\n"
-        f"<b>Extra tags :</b>\n{extra_display}"
-        "</blockquote>"
+    text = STATUS_TEXT.format(
+        state="⏸ PAUSED" if paused else "▶️ RUNNING",
+        live="🟢 ON" if autolive else "🔴 OFF",
+        src=src,
+        tgt=tgt,
+        interval=fmt_interval(interval),
+        start_id=start_id,
+        ptr=ptr,
+        posted=posted,
+        last=last,
+        n_filters=len(filters_lst),
+        tag=tag_display,
+        extra=extra_display,
     )
     await update.message.reply_text(text, parse_mode=ParseMode.HTML)
 
@@ -326,11 +447,23 @@ async def cmd_status(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
 # /stats
 # ─────────────────────────────────────────────────────────────────────────────
 
+STATS_TEXT = (
+    "📈  <b>Posting Statistics</b>\n\n"
+    "<blockquote>"
+    "<b>Total posted   :</b> <code>{posted}</code>\n"
+    "<b>Last post      :</b> <code>{last}</code>\n"
+    "<b>Current interval:</b> <code>{interval}</code>\n"
+    "<b>Estimated/day  :</b> <code>~{daily}</code>\n"
+    "<b>Estimated/week :</b> <code>~{weekly}</code>"
+    "</blockquote>"
+)
+
+
 @_admin_only
 async def cmd_stats(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     db: Database = context.bot_data["db"]
-    posted   = db.total_posted()
-    last     = db.last_post_time() or "Never"
+    posted, last = db.post_summary()
+    last     = last or "Never"
     interval = db.get_int("interval_seconds", 600)
 
     if posted > 0 and interval > 0:
@@ -339,76 +472,125 @@ async def cmd_stats(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     else:
         daily = weekly = 0
 
-    text = (
-        "📈  <b>Posting Statistics</b>\n\n"
-        "<blockquote>"
-        f"<b>Total posted   :</b> <code>{posted}</code>\n"
-        f"<b>Last post      :</b> <code>{last}</code>\n"
-        f"<b>Current interval:</b> <code>{fmt_interval(interval)}</code>\n"
-        f"<b>Estimated/day  :</b> <code>~{daily}</code>\n"
-        f"<b>Estimated/week :</b> <code>~{weekly}</code>"
-        "</blockquote>"
+    text = STATS_TEXT.format(
+        posted=posted,
+        last=last,
+        interval=fmt_interval(interval),
+        daily=daily,
+        weekly=weekly,
     )
     await update.message.reply_text(text, parse_mode=ParseMode.HTML)
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Channel resolution (shared by the setters and the scheduler)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _resolve_chat(raw: str | None) -> int | str | None:
+    """Stored channel value → int ID, "@username" str, or None when unset."""
+    if not raw or raw in ("0", "None"):
+        return None
+    try:
+        return int(raw)
+    except ValueError:
+        return raw  # username
+
+
+def _resolved_channels(bot_data: dict) -> tuple[int | str | None, int | str | None]:
+    """
+    (source, target) as the scheduler needs them, cached in bot_data so
+    each tick skips the settings reads and int parsing.  Every write goes
+    through _set_channel, which drops the cached pair.
+    """
+    pair = bot_data.get("_resolved_channels")
+    if pair is None:
+        cfg: Config   = bot_data["config"]
+        db:  Database = bot_data["db"]
+        pair = (
+            _resolve_chat(db.get("source_channel_id") or str(cfg.source_channel_id)),
+            _resolve_chat(db.get("target_channel_id") or str(cfg.target_channel_id)),
+        )
+        bot_data["_resolved_channels"] = pair
+    return pair
+
+
+def _footer_channel(bot_data: dict) -> tuple[str, str]:
+    """
+    (channel_username, channel_link) for the caption footer — the stored
+    override or the config default.  No command edits these, so they are
+    resolved once and kept in bot_data.
+    """
+    pair = bot_data.get("_footer_channel")
+    if pair is None:
+        cfg: Config   = bot_data["config"]
+        db:  Database = bot_data["db"]
+        pair = bot_data["_footer_channel"] = (
+            db.get("channel_username") or cfg.channel_username,
+            db.get("channel_link") or cfg.channel_link,
+        )
+    return pair
+
+
+def _set_channel(context: ContextTypes.DEFAULT_TYPE, key: str, value) -> None:
+    context.bot_data["db"].set(key, value)
+    context.bot_data.pop("_resolved_channels", None)
+
+
+def _extract_forward(msg: Message) -> tuple[int | None, int | None]:
+    """
+    (chat_id, message_id) of the channel post *msg* was forwarded from, or
+    (None, None) for anything else (plain message, user or hidden origin).
+    """
+    origin = msg.forward_origin
+    if isinstance(origin, MessageOriginChannel):
+        return origin.chat.id, origin.message_id
+    return None, None
+
+
+def _classify_channel_arg(raw: str) -> int | str | None:
+    """Typed channel argument (t.me link, numeric ID or @username) → value to store, or None."""
+    if "t.me" in raw:
+        parsed = parse_tme_link(raw)
+        if parsed:
+            return parsed[0]
+    try:
+        return int(raw)
+    except ValueError:
+        pass
+    return raw if raw.startswith("@") else None
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # /setsource  –  accepts forwarded message OR text with ID/link
 # ─────────────────────────────────────────────────────────────────────────────
 
 @_admin_only
 async def cmd_setsource(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    db: Database = context.bot_data["db"]
     msg = update.message
 
-    # Case 1: message is forwarded from a channel (PTB v21+ uses forward_origin)
-    chat_id = None
-    if hasattr(msg, "forward_origin") and msg.forward_origin:
-        if getattr(msg.forward_origin, "chat", None):
-            chat_id = msg.forward_origin.chat.id
-    elif getattr(msg, "forward_from_chat", None):
-        chat_id = msg.forward_from_chat.id
-
+    # Case 1: message is forwarded from a channel
+    chat_id, _ = _extract_forward(msg)
     if chat_id:
-        db.set("source_channel_id", chat_id)
+        _set_channel(context, "source_channel_id", chat_id)
         await msg.reply_text(
             f"✅ Source channel set to <code>{chat_id}</code>",
             parse_mode=ParseMode.HTML,
         )
         return
 
-    if getattr(msg, "forward_date", None) or getattr(msg, "forward_origin", None):
+    if msg.forward_origin:
         await msg.reply_text("❌ Could not read the source channel. Channel ID is hidden due to privacy settings. Try pasting the ID/link.")
         return
 
     # Case 2: user typed an ID or t.me link
-    raw = " ".join(context.args or []).strip() if context.args else (msg.text or "").strip()
-    raw = raw.replace("/setsource", "").strip()
+    raw = _arg_text(context) or (msg.text or "").strip()
+    raw = raw.removeprefix("/setsource").strip()
 
-    if "t.me" in raw:
-        parsed = parse_tme_link(raw)
-        if parsed:
-            chat_id = parsed[0]
-            db.set("source_channel_id", chat_id)
-            await msg.reply_text(
-                f"✅ Source channel set to <code>{chat_id}</code>",
-                parse_mode=ParseMode.HTML,
-            )
-            return
-
-    if raw.lstrip("-").isdigit():
-        db.set("source_channel_id", raw)
-        await msg.reply_text(
-            f"✅ Source channel set to <code>{raw}</code>",
-            parse_mode=ParseMode.HTML,
-        )
-        return
-
-    # Username
-    if raw.startswith("@"):
-        db.set("source_channel_id", raw)
+    chat_id = _classify_channel_arg(raw)
+    if chat_id is not None:
+        _set_channel(context, "source_channel_id", chat_id)
         await msg.reply_text(
-            f"✅ Source channel set to <code>{raw}</code>",
+            f"✅ Source channel set to <code>{chat_id}</code>",
             parse_mode=ParseMode.HTML,
         )
         return
@@ -429,29 +611,22 @@ async def cmd_setsource(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 
 @_admin_only
 async def cmd_settarget(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    db: Database = context.bot_data["db"]
     msg = update.message
 
-    chat_id = None
-    if hasattr(msg, "forward_origin") and msg.forward_origin:
-        if getattr(msg.forward_origin, "chat", None):
-            chat_id = msg.forward_origin.chat.id
-    elif getattr(msg, "forward_from_chat", None):
-        chat_id = msg.forward_from_chat.id
-
+    chat_id, _ = _extract_forward(msg)
     if chat_id:
-        db.set("target_channel_id", chat_id)
+        _set_channel(context, "target_channel_id", chat_id)
         await msg.reply_text(
             f"✅ Target channel set to <code>{chat_id}</code>",
             parse_mode=ParseMode.HTML,
         )
         return
 
-    raw = " ".join(context.args or []).strip() if context.args else ""
-    if raw:
-        db.set("target_channel_id", raw)
+    chat_id = _classify_channel_arg(_arg_text(context))
+    if chat_id is not None:
+        _set_channel(context, "target_channel_id", chat_id)
         await msg.reply_text(
-            f"✅ Target channel set to <code>{raw}</code>",
+            f"✅ Target channel set to <code>{chat_id}</code>",
             parse_mode=ParseMode.HTML,
         )
         return
@@ -466,6 +641,13 @@ async def cmd_settarget(update: Update, context: ContextTypes.DEFAULT_TYPE) -> N
 # /channels
 # ─────────────────────────────────────────────────────────────────────────────
 
+CHANNELS_TEXT = (
+    "🔗 <b>Channel Config</b>\n\n"
+    "<b>Source :</b> <code>{src}</code>\n"
+    "<b>Target :</b> <code>{tgt}</code>"
+)
+
+
 @_admin_only
 async def cmd_channels(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     db: Database = context.bot_data["db"]
@@ -473,9 +655,7 @@ async def cmd_channels(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     src = db.get("source_channel_id") or str(cfg.source_channel_id) or "<i>not set</i>"
     tgt = db.get("target_channel_id") or str(cfg.target_channel_id) or "<i>not set</i>"
     await update.message.reply_text(
-        f"🔗 <b>Channel Config</b>\n\n"
-        f"<b>Source :</b> <code>{src}</code>\n"
-        f"<b>Target :</b> <code>{tgt}</code>",
+        CHANNELS_TEXT.format(src=src, tgt=tgt),
         parse_mode=ParseMode.HTML,
     )
 
@@ -489,21 +669,10 @@ async def cmd_setstart(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     db: Database = context.bot_data["db"]
     msg = update.message
 
-    # Case 1: forwarded message — capture its original message_id and chat (PTB v21 uses forward_origin)
-    chat_id = None
-    msg_id = None
-
-    if hasattr(msg, "forward_origin") and msg.forward_origin:
-        origin = msg.forward_origin
-        if getattr(origin, "chat", None):
-            chat_id = origin.chat.id
-            msg_id = getattr(origin, "message_id", None)
-    elif getattr(msg, "forward_from_chat", None):
-        chat_id = msg.forward_from_chat.id
-        msg_id  = getattr(msg, "forward_from_message_id", None)
-
+    # Case 1: forwarded message — capture its original message_id and chat
+    chat_id, msg_id = _extract_forward(msg)
     if chat_id and msg_id:
-        db.set("source_channel_id", chat_id)
+        _set_channel(context, "source_channel_id", chat_id)
         db.set("start_msg_id",      msg_id)
         db.set("current_msg_id",    msg_id)
         await msg.reply_text(
@@ -516,20 +685,20 @@ async def cmd_setstart(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
         )
         return
 
-    if getattr(msg, "forward_date", None) or getattr(msg, "forward_origin", None):
+    if msg.forward_origin:
         await msg.reply_text("❌ Could not read the source channel from this forward (likely cloaked by privacy settings). Please paste the t.me link instead.")
         return
 
     # Case 2: t.me link or raw msg ID
-    raw = " ".join(context.args or []).strip()
+    raw = _arg_text(context)
     if not raw:
-        raw = (msg.text or "").replace("/setstart", "").strip()
+        raw = (msg.text or "").removeprefix("/setstart").strip()
 
     if "t.me" in raw:
         parsed = parse_tme_link(raw)
         if parsed:
             chat_id, msg_id = parsed
-            db.set("source_channel_id", chat_id)
+            _set_channel(context, "source_channel_id", chat_id)
             db.set("start_msg_id",      msg_id)
             db.set("current_msg_id",    msg_id)
             await msg.reply_text(
@@ -541,8 +710,11 @@ async def cmd_setstart(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
             )
             return
 
-    if raw.isdigit():
+    try:
         msg_id = int(raw)
+    except ValueError:
+        msg_id = 0
+    if msg_id > 0:
         chat_id = db.get("source_channel_id")
         if chat_id:
             db.set("start_msg_id", msg_id)
@@ -575,7 +747,7 @@ async def cmd_setstart(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 @_admin_only
 async def cmd_interval(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     db: Database = context.bot_data["db"]
-    raw = " ".join(context.args or []).strip()
+    raw = _arg_text(context)
 
     if not raw:
         current = db.get_int("interval_seconds", 600)
@@ -606,14 +778,8 @@ async def cmd_interval(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
     # Reschedule the job
     jq = context.job_queue
     if jq:
-        for job in jq.get_jobs_by_name("publisher_job"):
-            job.schedule_removal()
-        jq.run_repeating(
-            _publisher_job_callback,
-            interval=seconds,
-            first=5, # start in 5 seconds to give immediate feedback
-            name="publisher_job",
-        )
+        # start in 5 seconds to give immediate feedback
+        schedule_publisher(jq, context.bot_data, seconds, first=5)
 
     await update.message.reply_text(
         f"✅  Interval set to <b>{fmt_interval(seconds)}</b>",
@@ -625,43 +791,74 @@ async def cmd_interval(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 # /pause  /resume  /autolive
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _is_paused(bot_data: dict) -> bool:
+    """In-memory copy of the "paused" setting, loaded on first use."""
+    paused = bot_data.get("_paused")
+    if paused is None:
+        db: Database = bot_data["db"]
+        paused = bot_data["_paused"] = db.get_bool("paused", False)
+    return paused
+
+
+def _set_paused(context: ContextTypes.DEFAULT_TYPE, paused: bool) -> None:
+    context.bot_data["db"].set_bool("paused", paused)
+    context.bot_data["_paused"] = paused
+
+
+def _is_autolive(bot_data: dict) -> bool:
+    """In-memory copy of the "auto_forward" setting, loaded on first use."""
+    autolive = bot_data.get("_autolive")
+    if autolive is None:
+        db: Database = bot_data["db"]
+        autolive = bot_data["_autolive"] = db.get_bool("auto_forward", False)
+    return autolive
+
+
+def _set_autolive(context: ContextTypes.DEFAULT_TYPE, autolive: bool) -> None:
+    context.bot_data["db"].set_bool("auto_forward", autolive)
+    context.bot_data["_autolive"] = autolive
+
+
 @_admin_only
 async def cmd_pause(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    db: Database = context.bot_data["db"]
-    db.set("paused", "true")
+    _set_paused(context, True)
     text = "⏸  Bot paused. Posts will not be sent until /resume."
     if update.callback_query:
-        await update.callback_query.message.edit_text(text, reply_markup=_main_keyboard(db))
+        await update.callback_query.message.edit_text(text, reply_markup=_main_keyboard(context.bot_data))
     else:
         await update.message.reply_text(text)
 
 
 @_admin_only
 async def cmd_resume(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    db: Database = context.bot_data["db"]
-    db.set("paused", "false")
+    _set_paused(context, False)
     # Ensure the scheduler job is running
     _ensure_job(context)
     text = "▶️  Bot resumed! Next post in the scheduled interval."
     if update.callback_query:
-        await update.callback_query.message.edit_text(text, reply_markup=_main_keyboard(db))
+        await update.callback_query.message.edit_text(text, reply_markup=_main_keyboard(context.bot_data))
     else:
         await update.message.reply_text(text)
 
 
+_AUTOLIVE_MSGS = {
+    "on":  (True,  "🟢  <b>Auto-Live:</b> ON\n\nNew messages posted to the source channel will now be forwarded immediately."),
+    "off": (False, "🔴  <b>Auto-Live:</b> OFF\n\nThe bot will now <i>only</i> post from the queue scheduler (/setstart)."),
+}
+
+
 @_admin_only
 async def cmd_autolive(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    db: Database = context.bot_data["db"]
-    raw = " ".join(context.args or []).strip().lower()
-
-    if raw == "on":
-        db.set("auto_forward", "true")
-        await update.message.reply_text("🟢  <b>Auto-Live:</b> ON\n\nNew messages posted to the source channel will now be forwarded immediately.", parse_mode=ParseMode.HTML)
-    elif raw == "off":
-        db.set("auto_forward", "false")
-        await update.message.reply_text("🔴  <b>Auto-Live:</b> OFF\n\nThe bot will now <i>only</i> post from the queue scheduler (/setstart).", parse_mode=ParseMode.HTML)
+    # Only "on"/"off" matter, so look at the first word alone
+    raw = context.args[0].lower() if context.args else ""
+
+    hit = _AUTOLIVE_MSGS.get(raw)
+    if hit:
+        on, text = hit
+        _set_autolive(context, on)
+        await update.message.reply_text(text, parse_mode=ParseMode.HTML)
     else:
-        state = "🟢 ON" if db.get_bool("auto_forward", False) else "🔴 OFF"
+        state = "🟢 ON" if _is_autolive(context.bot_data) else "🔴 OFF"
         await update.message.reply_text(
             f"<b>Auto-Live Status:</b> {state}\n\n"
             "Use <code>/autolive on</code> to instantly forward new posts.\n"
@@ -671,16 +868,14 @@ async def cmd_autolive(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 
 @_admin_only
 async def cmd_autolive_toggle(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    db: Database = context.bot_data["db"]
-    current = db.get_bool("auto_forward", False)
-    new_state = not current
-    db.set("auto_forward", "true" if new_state else "false")
+    new_state = not _is_autolive(context.bot_data)
+    _set_autolive(context, new_state)
     
     state_str = "🟢 ON" if new_state else "🔴 OFF"
     text = f"<b>Auto-Live toggled to:</b> {state_str}"
     
     if update.callback_query:
-        await update.callback_query.message.edit_text(text, parse_mode=ParseMode.HTML, reply_markup=_main_keyboard(db))
+        await update.callback_query.message.edit_text(text, parse_mode=ParseMode.HTML, reply_markup=_main_keyboard(context.bot_data))
     else:
         await update.message.reply_text(text, parse_mode=ParseMode.HTML)
 
@@ -689,29 +884,42 @@ async def cmd_autolive_toggle(update: Update, context: ContextTypes.DEFAULT_TYPE
 # /queue
 # ─────────────────────────────────────────────────────────────────────────────
 
+QUEUE_TEXT = (
+    "🗂  <b>Queue Status</b>\n\n"
+    "<blockquote>"
+    "<b>State       :</b> {state}\n"
+    "<b>Start msg   :</b> <code>{start_id}</code>\n"
+    "<b>Current ptr :</b> <code>{ptr}</code> (next to post)\n"
+    "<b>Interval    :</b> <code>{interval}</code>\n"
+    "<b>Next post ~  :</b> <code>{next_str}</code>"
+    "</blockquote>"
+)
+
+
 @_admin_only
 async def cmd_queue(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     db: Database = context.bot_data["db"]
-    paused   = db.get_bool("paused", False)
-    interval = db.get_int("interval_seconds", 600)
-    ptr      = db.get_int("current_msg_id", 0)
-    start_id = db.get_int("start_msg_id", 0)
-
-    if interval > 0:
-        next_post = datetime.utcnow() + timedelta(seconds=interval)
-        next_str  = next_post.strftime("%H:%M:%S UTC")
+    vals     = db.multi_get(_DASHBOARD_KEYS)
+    paused   = _is_paused(context.bot_data)
+    interval = db.parse_int(vals.get("interval_seconds"), 600)
+    ptr      = db.parse_int(vals.get("current_msg_id"), 0)
+    start_id = db.parse_int(vals.get("start_msg_id"), 0)
+
+    # Ask the scheduler when the job actually fires next instead of guessing
+    # "now + interval", which is only right at the very start of a cycle.
+    job  = _publisher_job(context.bot_data)
+    next_t = job.next_t if job else None
+    if next_t is not None:
+        next_str = next_t.astimezone(timezone.utc).strftime("%H:%M:%S UTC")
     else:
         next_str = "N/A"
 
-    text = (
-        "🗂  <b>Queue Status</b>\n\n"
-        "<blockquote>"
-        f"<b>State       :</b> {'⏸ Paused' if paused else '▶️ Running'}\n"
-        f"<b>Start msg   :</b> <code>{start_id}</code>\n"
-        f"<b>Current ptr :</b> <code>{ptr}</code> (next to post)\n"
-        f"<b>Interval    :</b> <code>{fmt_interval(interval)}</code>\n"
-        f"<b>Next post ~  :</b> <code>{next_str}</code>"
-        "</blockquote>"
+    text = QUEUE_TEXT.format(
+        state="⏸ Paused" if paused else "▶️ Running",
+        start_id=start_id,
+        ptr=ptr,
+        interval=fmt_interval(interval),
+        next_str=next_str,
     )
     await update.message.reply_text(text, parse_mode=ParseMode.HTML)
 
@@ -748,10 +956,30 @@ async def cmd_testpost(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 # Tag commands
 # ─────────────────────────────────────────────────────────────────────────────
 
+def _extra_tags_html(bot_data: dict) -> tuple[str, str]:
+    """
+    Extra tags rendered for /status (bullets) and /tags (numbered).
+    Cached in bot_data; /addtag and /removetag drop it.
+    """
+    rendered = bot_data.get("_extra_tags_html")
+    if rendered is None:
+        db: Database = bot_data["db"]
+        extra = db.list_tags()
+        if extra:
+            rendered = (
+                "\n".join(f"  • {t}" for t in extra),
+                "\n".join(f"  {i+1}. {t}" for i, t in enumerate(extra)),
+            )
+        else:
+            rendered = ("  <i>none</i>", "  <i>none</i>")
+        bot_data["_extra_tags_html"] = rendered
+    return rendered
+
+
 @_admin_only
 async def cmd_settag(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     db: Database = context.bot_data["db"]
-    raw = " ".join(context.args or []).strip()
+    raw = _arg_text(context)
     if not raw:
         await update.message.reply_text(
             "Usage: /settag ⚡ Powered by @MyChannel",
@@ -772,38 +1000,40 @@ async def cmd_cleartag(update: Update, context: ContextTypes.DEFAULT_TYPE) -> No
 @_admin_only
 async def cmd_addtag(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     db: Database = context.bot_data["db"]
-    raw = " ".join(context.args or []).strip()
+    raw = _arg_text(context)
     if not raw:
         await update.message.reply_text("Usage: /addtag &lt;text&gt;", parse_mode=ParseMode.HTML)
         return
-    existing = db.get("extra_tags") or ""
-    tags = [t for t in existing.split("|||") if t]
-    if raw not in tags:
-        tags.append(raw)
-    db.set("extra_tags", "|||".join(tags))
+    if db.add_tag(raw):
+        context.bot_data.pop("_extra_tags_html", None)
     await update.message.reply_text(f"✅  Tag added: <b>{raw}</b>", parse_mode=ParseMode.HTML)
 
 
 @_admin_only
 async def cmd_removetag(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     db: Database = context.bot_data["db"]
-    raw = " ".join(context.args or []).strip()
-    existing = db.get("extra_tags") or ""
-    tags = [t for t in existing.split("|||") if t and t != raw]
-    db.set("extra_tags", "|||".join(tags))
+    raw = _arg_text(context)
+    if not db.remove_tag(raw):
+        await update.message.reply_text(f"❓  No such tag: <code>{raw}</code>", parse_mode=ParseMode.HTML)
+        return
+    context.bot_data.pop("_extra_tags_html", None)
     await update.message.reply_text(f"🗑  Tag removed: <code>{raw}</code>", parse_mode=ParseMode.HTML)
 
 
+TAGS_TEXT = (
+    "🏷  <b>Current Tags</b>\n\n"
+    "<b>Footer tag :</b> {custom}\n\n"
+    "<b>Extra tags :</b>\n{extra}"
+)
+
+
 @_admin_only
 async def cmd_tags(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     db: Database = context.bot_data["db"]
     custom = db.get("custom_tag") or "<i>none</i>"
-    extra  = [t for t in (db.get("extra_tags") or "").split("|||") if t]
-    extra_str = "\n".join(f"  {i+1}. {t}" for i, t in enumerate(extra)) if extra else "  <i>none</i>"
+    extra_str = _extra_tags_html(context.bot_data)[1]
     await update.message.reply_text(
-        f"🏷  <b>Current Tags</b>\n\n"
-        f"<b>Footer tag :</b> {custom}\n\n"
-        f"<b>Extra tags :</b>\n{extra_str}",
+        TAGS_TEXT.format(custom=custom, extra=extra_str),
         parse_mode=ParseMode.HTML,
     )
 
@@ -815,20 +1045,22 @@ async def cmd_tags(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
 @_admin_only
 async def cmd_addfilter(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     db: Database = context.bot_data["db"]
-    raw = " ".join(context.args or []).strip().lower()
-    if not raw:
-        await update.message.reply_text("Usage: /addfilter <keyword or phrase>", parse_mode=ParseMode.HTML)
+    words = [w.strip() for w in _arg_text(context).lower().split(",")]
+    words = [w for w in words if w]
+    if not words:
+        await update.message.reply_text("Usage: /addfilter &lt;keyword or phrase&gt;[, …]", parse_mode=ParseMode.HTML)
         return
-    db.add_filter(raw)
-    await update.message.reply_text(f"✅  Filter added. Messages containing <code>{raw}</code> will be ignored.", parse_mode=ParseMode.HTML)
+    db.add_filters(words)
+    shown = ", ".join(f"<code>{w}</code>" for w in words)
+    await update.message.reply_text(f"✅  Filter added. Messages containing {shown} will be ignored.", parse_mode=ParseMode.HTML)
 
 
 @_admin_only
 async def cmd_removefilter(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     db: Database = context.bot_data["db"]
-    raw = " ".join(context.args or []).strip().lower()
+    raw = _arg_text(context).lower()
     if not raw:
-        await update.message.reply_text("Usage: /removefilter <keyword>", parse_mode=ParseMode.HTML)
+        await update.message.reply_text("Usage: /removefilter &lt;keyword&gt;", parse_mode=ParseMode.HTML)
         return
     db.remove_filter(raw)
     await update.message.reply_text(f"🗑  Filter removed: <code>{raw}</code>", parse_mode=ParseMode.HTML)
@@ -852,32 +1084,35 @@ async def cmd_filters(update: Update, context: ContextTypes.DEFAULT_TYPE) -> Non
 @_admin_only
 async def cmd_addadmin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     db: Database = context.bot_data["db"]
-    raw = " ".join(context.args or []).strip()
-    if not raw.lstrip("-").isdigit():
+    try:
+        uid = int(_arg_text(context))
+    except ValueError:
         await update.message.reply_text("Usage: /addadmin &lt;user_id&gt;", parse_mode=ParseMode.HTML)
         return
-    uid = int(raw)
     db.add_admin(uid)
+    context.bot_data.pop("_admin_set", None)
     await update.message.reply_text(f"✅  <code>{uid}</code> is now an admin.", parse_mode=ParseMode.HTML)
 
 
 @_admin_only
 async def cmd_removeadmin(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     db: Database = context.bot_data["db"]
-    raw = " ".join(context.args or []).strip()
-    if not raw.lstrip("-").isdigit():
+    try:
+        uid = int(_arg_text(context))
+    except ValueError:
         await update.message.reply_text("Usage: /removeadmin &lt;user_id&gt;", parse_mode=ParseMode.HTML)
         return
-    uid = int(raw)
     db.remove_admin(uid)
+    context.bot_data.pop("_admin_set", None)
     await update.message.reply_text(f"🗑  <code>{uid}</code> removed from admins.", parse_mode=ParseMode.HTML)
 
 
 @_admin_only
 async def cmd_admins(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-    db: Database  = context.bot_data["db"]
     cfg: Config   = context.bot_data["config"]
-    all_admins    = list(set(cfg.admin_ids + db.extra_admins()))
+    db:  Database = context.bot_data["db"]
+    # Config admins first, then the /addadmin ones (both by ID)
+    all_admins    = dict.fromkeys((*sorted(cfg.admin_ids), *db.extra_admins()))
     lines         = "\n".join(f"  • <code>{uid}</code>" for uid in all_admins)
     await update.message.reply_text(
         f"👑  <b>Admins</b>\n{lines}",
@@ -889,25 +1124,26 @@ async def cmd_admins(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None
 # Inline button callbacks
 # ─────────────────────────────────────────────────────────────────────────────
 
+_CB_HANDLERS = {
+    "cb_status":   cmd_status,
+    "cb_stats":    cmd_stats,
+    "cb_resume":   cmd_resume,
+    "cb_pause":    cmd_pause,
+    "cb_autolive_toggle": cmd_autolive_toggle,
+    "cb_skip":     cmd_skipnext,
+    "cb_testpost": cmd_testpost,
+    "cb_channels": cmd_channels,
+    "cb_tags":     cmd_tags,
+    "cb_filters":  cmd_filters,
+    "cb_help":     cmd_help,
+}
+
+
 async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
     query = update.callback_query
     await query.answer()
-    data = query.data
-
-    handlers = {
-        "cb_status":   cmd_status,
-        "cb_stats":    cmd_stats,
-        "cb_resume":   cmd_resume,
-        "cb_pause":    cmd_pause,
-        "cb_autolive_toggle": cmd_autolive_toggle,
-        "cb_skip":     cmd_skipnext,
-        "cb_testpost": cmd_testpost,
-        "cb_channels": cmd_channels,
-        "cb_tags":     cmd_tags,
-        "cb_filters":  cmd_filters,
-        "cb_help":     cmd_help,
-    }
-    fn = handlers.get(data)
+
+    fn = _CB_HANDLERS.get(query.data)
     if fn:
         # patch update so handler thinks it's a message reply
         update._effective_message = query.message  # type: ignore[attr-defined]
@@ -919,162 +1155,290 @@ async def handle_callback(update: Update, context: ContextTypes.DEFAULT_TYPE) ->
 # Publisher job (called by scheduler)
 # ─────────────────────────────────────────────────────────────────────────────
 
+_SKIP_WINDOW = 500   # max already-posted IDs skipped in one tick
+
+
 async def _publisher_job_callback(context: ContextTypes.DEFAULT_TYPE) -> None:
     """
-    Scheduled job: fetch the next message_id from source channel and publish it.
-    Increments current_msg_id on success (and skips non-media).
+    Scheduled job (also run by /testpost).  The publish itself runs as an
+    application task so the job returns at once; a tick that fires while
+    the previous publish still holds the lock is dropped rather than racing
+    it for the same current_msg_id.
     """
-    from publisher import publish_message
+    bot_data = context.bot_data
+    retry_at = bot_data.get("_retry_at")
+    if retry_at is not None and time.monotonic() < retry_at:
+        logger.debug("Publisher job: backing off, skipping.")
+        return
+    lock: asyncio.Lock | None = bot_data.get("_publisher_lock")
+    if lock is None:
+        lock = bot_data["_publisher_lock"] = asyncio.Lock()
+    if lock.locked():
+        logger.debug("Publisher job: previous tick still running, skipping.")
+        return
+    await lock.acquire()   # free, so this never suspends
+    context.application.create_task(_publish_and_release(context, lock))
 
-    db: Database  = context.bot_data["db"]
-    cfg: "Config" = context.bot_data["config"]
 
-    if db.get_bool("paused", False):
+async def _publish_and_release(context: ContextTypes.DEFAULT_TYPE, lock: asyncio.Lock) -> None:
+    try:
+        await _publish_next(context)
+    finally:
+        lock.release()
+
+
+# Plain settings the job reads each tick, fetched with one multi_get()
+_PUBLISH_KEYS = ("current_msg_id", "custom_tag")
+
+
+async def _publish_next(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Fetch the next message_id from source channel and publish it.
+    Increments current_msg_id on success (and skips non-media).
+    """
+    bot_data      = context.bot_data
+    db: Database  = bot_data["db"]
+    cfg: "Config" = bot_data["config"]
+
+    if _is_paused(bot_data):
         logger.debug("Publisher job: paused, skipping.")
         return
 
-    src_raw = db.get("source_channel_id") or str(cfg.source_channel_id)
-    tgt_raw = db.get("target_channel_id") or str(cfg.target_channel_id)
-
-    if not src_raw or src_raw in ("0", "None") or not tgt_raw or tgt_raw in ("0", "None"):
+    source_chat_id, target_chat_id = _resolved_channels(bot_data)
+    if source_chat_id is None or target_chat_id is None:
         logger.warning("Publisher job: source or target channel not set.")
         return
 
-    try:
-        source_chat_id = int(src_raw)
-        target_chat_id = int(tgt_raw)
-    except ValueError:
-        source_chat_id = src_raw  # username
-        target_chat_id = tgt_raw
-
-    ptr = db.get_int("current_msg_id", 0)
+    vals = db.multi_get(_PUBLISH_KEYS)
+    ptr  = db.parse_int(vals.get("current_msg_id"), 0)
     if ptr == 0:
-        logger.info("Publisher job: no start message set.")
+        logger.debug("Publisher job: no start message set.")
         return
 
-    if db.was_posted(source_chat_id, ptr):
-        logger.info("msg_id %d already posted, advancing pointer.", ptr)
-        db.set("current_msg_id", ptr + 1)
+    # Fast-forward over a run of already-posted IDs with one query and one write
+    posted = db.was_posted_bulk(source_chat_id, ptr, ptr + _SKIP_WINDOW - 1)
+    if ptr in posted:
+        start = ptr
+        while ptr in posted:
+            ptr += 1
+        logger.debug("msg_ids %d–%d already posted, advancing pointer to %d.", start, ptr - 1, ptr)
+        db.set_current_msg_id(ptr)
         return
 
-    # Check filters before doing anything heavy
-    msg = None
+    custom_tag  = vals.get("custom_tag", "")
+    extra_tags  = db.list_tags()
+    channel_username, channel_link = _footer_channel(bot_data)
+    http = bot_data.get("http")
+
+    logger.info("Publishing msg_id=%d from %s → %s", ptr, source_chat_id, target_chat_id)
+
     try:
-        msg = await context.bot.forward_message(
-            chat_id=context.bot.id, # forward to self to inspect
-            from_chat_id=source_chat_id,
-            message_id=ptr,
-            disable_notification=True,
+        success = await publish_message(
+            bot=context.bot,
+            source_chat_id=source_chat_id,
+            source_msg_id=ptr,
+            target_chat_id=target_chat_id,
+            tmdb_api_key=cfg.tmdb_api_key,
+            omdb_api_key=cfg.omdb_api_key,
+            api_timeout=cfg.api_timeout,
+            channel_username=channel_username,
+            channel_link=channel_link,
+            custom_tag=custom_tag,
+            extra_tags=extra_tags,
+            banned=db.get_filters_compiled(),
+            db=db,
+            http=http,
         )
-    except Exception as e:
-        logger.warning(f"Failed to pre-fetch message {ptr} for filter check: {e}")
-
-    if msg:
-        from publisher import _extract_media
-        media_info = _extract_media(msg)
-        caption_text = (msg.caption or msg.text or "").lower()
-        file_name = (media_info[1] if media_info else "").lower()
-        search_str = f"{caption_text} {file_name}"
-        
-        banned_words = db.get_filters()
-        for word in banned_words:
-            if word in search_str:
-                logger.info("msg_id %d blocked by filter: '%s', advancing pointer.", ptr, word)
-                db.set("current_msg_id", ptr + 1)
-                try:
-                    await msg.delete()
-                except:
-                    pass
-                return
-
-        try:
-            await msg.delete()
-        except:
-            pass
+    except TelegramError as exc:
+        if not is_transient(exc):
+            raise
+        _back_off(context, ptr, exc)
+        return
+    bot_data.pop("_retry_at", None)
+    bot_data.pop("_retries", None)
 
-    custom_tag  = db.get("custom_tag", "")
-    extra_raw   = db.get("extra_tags", "")
-    extra_tags  = [t for t in extra_raw.split("|||") if t] if extra_raw else []
+    if not success:
+        # Permanent failure (deleted / unsendable message): skip past the gap
+        logger.warning("msg_id %d failed, advancing pointer anyway.", ptr)
 
-    logger.info("Publishing msg_id=%d from %s → %s", ptr, source_chat_id, target_chat_id)
+    # Step over any already-posted IDs that follow in the same write, so
+    # the next tick does not spend itself on fast-forwarding
+    nxt = ptr + 1
+    while nxt in posted:
+        nxt += 1
+    db.set_current_msg_id(nxt)
 
-    success = await publish_message(
+    # Warm up the next tick: its forward + metadata lookups run during the wait
+    prefetch_message(
         bot=context.bot,
         source_chat_id=source_chat_id,
-        source_msg_id=ptr,
+        source_msg_id=nxt,
         target_chat_id=target_chat_id,
         tmdb_api_key=cfg.tmdb_api_key,
         omdb_api_key=cfg.omdb_api_key,
         api_timeout=cfg.api_timeout,
-        channel_username=db.get("channel_username") or cfg.channel_username,
-        channel_link=db.get("channel_link") or cfg.channel_link,
-        custom_tag=custom_tag,
-        extra_tags=extra_tags,
+        http=http,
         db=db,
+        banned=db.get_filters_compiled(),
     )
 
-    if success:
-        db.set("current_msg_id", ptr + 1)
-    else:
-        # Advance anyway to avoid getting stuck on a deleted/non-media message
-        logger.warning("msg_id %d failed, advancing pointer anyway.", ptr)
-        db.set("current_msg_id", ptr + 1)
+
+def _back_off(context: ContextTypes.DEFAULT_TYPE, ptr: int, exc: TelegramError) -> None:
+    """
+    Transient failure: keep current_msg_id where it is and retry the same
+    message after Telegram's flood-wait, or an exponential delay.  Regular
+    ticks that fire before then are skipped.
+    """
+    retries = context.bot_data.get("_retries", 0) + 1
+    delay   = retry_delay(exc, retries)
+
+    context.bot_data["_retries"]  = retries
+    context.bot_data["_retry_at"] = time.monotonic() + delay
+    logger.warning("msg_id %d: %s — retry #%d in %.0f s.", ptr, exc, retries, delay)
+    if context.job_queue:
+        # +1 s so the retry never lands before _retry_at
+        context.job_queue.run_once(_publisher_job_callback, delay + 1, name="publisher_retry")
+
+
+def _publisher_job(bot_data: dict) -> Job | None:
+    """The live publisher job, remembered in bot_data so nobody scans the queue for it."""
+    job = bot_data.get("_pub_job")
+    return None if job is None or job.removed else job
+
+
+def schedule_publisher(jq: JobQueue, bot_data: dict, interval: int, first: float) -> None:
+    """
+    Start the repeating publisher job, or retime the live one in place;
+    every scheduling path goes through here.
+    """
+    job = _publisher_job(bot_data)
+    if job is not None:
+        # One scheduler mutation instead of remove + add
+        job.job.reschedule(
+            trigger="interval",
+            seconds=interval,
+            start_date=datetime.now(timezone.utc) + timedelta(seconds=first),
+        )
+        return
+    bot_data["_pub_job"] = jq.run_repeating(
+        _publisher_job_callback,
+        interval=interval,
+        first=first,
+        name="publisher_job",
+    )
 
 
 def _ensure_job(context: ContextTypes.DEFAULT_TYPE) -> None:
     """Start the publisher job if not already running."""
-    db: Database = context.bot_data["db"]
-    interval = db.get_int("interval_seconds", 600)
     jq = context.job_queue
-    if not jq:
+    if not jq or _publisher_job(context.bot_data) is not None:
         return
-    existing = jq.get_jobs_by_name("publisher_job")
-    if not existing:
-        jq.run_repeating(
-            _publisher_job_callback,
-            interval=interval,
-            first=interval,
-            name="publisher_job",
-        )
-        logger.info("Publisher job scheduled every %s", fmt_interval(interval))
+    db: Database = context.bot_data["db"]
+    interval = db.get_int("interval_seconds", 600)
+    schedule_publisher(jq, context.bot_data, interval, first=interval)
+    logger.info("Publisher job scheduled every %s", fmt_interval(interval))
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Register all handlers
 # ─────────────────────────────────────────────────────────────────────────────
 
+_ADMIN_CMDS = (
+    ("start",       cmd_start),
+    ("help",        cmd_help),
+    ("status",      cmd_status),
+    ("stats",       cmd_stats),
+    ("setsource",   cmd_setsource),
+    ("setchannel",  cmd_setsource), # Alias
+    ("settarget",   cmd_settarget),
+    ("channels",    cmd_channels),
+    ("setstart",    cmd_setstart),
+    ("interval",    cmd_interval),
+    ("pause",       cmd_pause),
+    ("resume",      cmd_resume),
+    ("autolive",    cmd_autolive),
+    ("skipnext",    cmd_skipnext),
+    ("testpost",    cmd_testpost),
+    ("queue",       cmd_queue),
+    ("settag",      cmd_settag),
+    ("cleartag",    cmd_cleartag),
+    ("addtag",      cmd_addtag),
+    ("removetag",   cmd_removetag),
+    ("tags",        cmd_tags),
+    ("addfilter",   cmd_addfilter),
+    ("removefilter",cmd_removefilter),
+    ("filters",     cmd_filters),
+    ("addadmin",    cmd_addadmin),
+    ("removeadmin", cmd_removeadmin),
+    ("admins",      cmd_admins),
+)
+
+
+_CMD_DISPATCH = dict(_ADMIN_CMDS)
+
+# Command menu shown by Telegram clients — rendered locally, no /help round-trip.
+_BOT_COMMANDS = (
+    BotCommand("start",        "Admin panel"),
+    BotCommand("help",         "Command reference"),
+    BotCommand("status",       "Full status"),
+    BotCommand("stats",        "Posting statistics"),
+    BotCommand("setsource",    "Set source channel"),
+    BotCommand("settarget",    "Set target channel"),
+    BotCommand("channels",     "Show current channels"),
+    BotCommand("setstart",     "Set the start message"),
+    BotCommand("interval",     "Set posting interval"),
+    BotCommand("pause",        "Pause queue posting"),
+    BotCommand("resume",       "Resume queue posting"),
+    BotCommand("autolive",     "Instant posting on/off"),
+    BotCommand("skipnext",     "Skip the next queued message"),
+    BotCommand("testpost",     "Force-post now"),
+    BotCommand("queue",        "Show queue status"),
+    BotCommand("settag",       "Set footer tag"),
+    BotCommand("cleartag",     "Remove footer tag"),
+    BotCommand("addtag",       "Add extra tag line"),
+    BotCommand("removetag",    "Remove a tag line"),
+    BotCommand("tags",         "List all tags"),
+    BotCommand("addfilter",    "Block a word"),
+    BotCommand("removefilter", "Unblock a word"),
+    BotCommand("filters",      "List active filters"),
+    BotCommand("addadmin",     "Grant admin"),
+    BotCommand("removeadmin",  "Revoke admin"),
+    BotCommand("admins",       "List all admins"),
+)
+
+
+async def publish_command_menu(app) -> None:
+    """Register _BOT_COMMANDS for each admin's private chat (non-admins see no menu)."""
+    for user_id in _admin_set(app.bot_data):
+        try:
+            await app.bot.set_my_commands(_BOT_COMMANDS, scope=BotCommandScopeChat(user_id))
+        except TelegramError as exc:
+            logger.debug("set_my_commands failed for %s: %s", user_id, exc)
+
+
+async def _dispatch_admin_cmd(update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
+    """
+    Route "/name[@bot] args…" to its handler with one dict lookup instead of
+    PTB testing every CommandHandler in turn.  Fills context.args the same
+    way CommandHandler does.
+    """
+    msg = update.message
+    if msg is None or not msg.text:
+        return
+    head, *args = msg.text.split()
+    name, _, bot_name = head[1:].partition("@")
+    if bot_name and bot_name.lower() != (context.bot.username or "").lower():
+        return
+    fn = _CMD_DISPATCH.get(name.lower())
+    if fn is None:
+        return
+    context.args = args
+    await fn(update, context)
+
+
 def register_admin_handlers(app) -> None:
     """Attach all admin command handlers to the PTB Application."""
-    cmds = [
-        ("start",       cmd_start),
-        ("help",        cmd_help),
-        ("status",      cmd_status),
-        ("stats",       cmd_stats),
-        ("setsource",   cmd_setsource),
-        ("setchannel",  cmd_setsource), # Alias
-        ("settarget",   cmd_settarget),
-        ("channels",    cmd_channels),
-        ("setstart",    cmd_setstart),
-        ("interval",    cmd_interval),
-        ("pause",       cmd_pause),
-        ("resume",      cmd_resume),
-        ("autolive",    cmd_autolive),
-        ("skipnext",    cmd_skipnext),
-        ("testpost",    cmd_testpost),
-        ("queue",       cmd_queue),
-        ("settag",      cmd_settag),
-        ("cleartag",    cmd_cleartag),
-        ("addtag",      cmd_addtag),
-        ("removetag",   cmd_removetag),
-        ("tags",        cmd_tags),
-        ("addfilter",   cmd_addfilter),
-        ("removefilter",cmd_removefilter),
-        ("filters",     cmd_filters),
-        ("addadmin",    cmd_addadmin),
-        ("removeadmin", cmd_removeadmin),
-        ("admins",      cmd_admins),
-    ]
-    for cmd_name, fn in cmds:
-        app.add_handler(CommandHandler(cmd_name, fn))
-
-    app.add_handler(CallbackQueryHandler(handle_callback))
+    app.add_handlers([
+        MessageHandler(filters.COMMAND, _dispatch_admin_cmd),
+        CallbackQueryHandler(handle_callback),
+    ])
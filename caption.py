@@ -5,7 +5,9 @@ caption.py  –  Content-type detection + HTML caption builder
 
 from __future__ import annotations
 
+import html
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -31,25 +33,34 @@ HEADER_MAP: dict[str, tuple[str, str, str]] = {
 # Content-type detection
 # ─────────────────────────────────────────────────────────────────────────────
 
-_KW: dict[str, re.Pattern] = {
-    "anime":  re.compile(r"\b(anime|アニメ|ova|ona|oav)\b", re.I),
-    "kdrama": re.compile(r"\b(kdrama|k-drama|korean[\s_-]*drama)\b", re.I),
-    "cdrama": re.compile(r"\b(cdrama|c-drama|chinese[\s_-]*drama|华剧|陆剧)\b", re.I),
-    "jdrama": re.compile(r"\b(jdrama|j-drama|japanese[\s_-]*drama|ドラマ)\b", re.I),
-    "kmovie": re.compile(r"\b(korean[\s_-]*movie|k-?movie)\b", re.I),
-    "jmovie": re.compile(r"\b(japanese[\s_-]*movie|j-?movie)\b", re.I),
-    "indian": re.compile(
+# Checked in order; the first type whose pattern matches wins
+_KW: tuple[tuple[str, re.Pattern], ...] = (
+    ("anime",  re.compile(r"\b(anime|アニメ|ova|ona|oav)\b", re.I)),
+    ("kdrama", re.compile(r"\b(kdrama|k-drama|korean[\s_-]*drama)\b", re.I)),
+    ("cdrama", re.compile(r"\b(cdrama|c-drama|chinese[\s_-]*drama|华剧|陆剧)\b", re.I)),
+    ("jdrama", re.compile(r"\b(jdrama|j-drama|japanese[\s_-]*drama|ドラマ)\b", re.I)),
+    ("kmovie", re.compile(r"\b(korean[\s_-]*movie|k-?movie)\b", re.I)),
+    ("jmovie", re.compile(r"\b(japanese[\s_-]*movie|j-?movie)\b", re.I)),
+    ("indian", re.compile(
         r"\b(bollywood|tollywood|kollywood|mollywood|"
         r"hindi|tamil|telugu|malayalam|kannada|bengali|marathi|punjabi)\b", re.I
-    ),
-}
+    )),
+)
 
 
-def detect_content_type(filename: str, guess: dict[str, Any]) -> str:
-    name = filename.lower()
-    for ctype, pattern in _KW.items():
-        if pattern.search(name):
+@lru_cache(maxsize=2048)
+def _keyword_type(filename: str) -> str | None:
+    """First _KW type matching *filename*, or None.  Retries and prefetch repeat names."""
+    for ctype, pattern in _KW:
+        if pattern.search(filename):
             return ctype
+    return None
+
+
+def detect_content_type(filename: str, guess: dict[str, Any]) -> str:
+    ctype = _keyword_type(filename)
+    if ctype is not None:
+        return ctype
     g_type = str(guess.get("type", "movie")).lower()
     return "series" if g_type == "episode" else "movie"
 
@@ -58,6 +69,82 @@ def detect_content_type(filename: str, guess: dict[str, Any]) -> str:
 # Caption builder
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Optional rows (episode, director, cast) and the footer tags are filled in
+# as whole "…\n" lines, or "" when absent.
+_CAPTION_TMPL = (
+    "{header}\n"
+    "\n"
+    "<blockquote>\n"
+    "<b>{media_emoji}  {title}</b>  {flag_emoji}\n"
+    "\n"
+    "{episode_line}"
+    "├ 📅  <b>Year     :</b>  <code>{year}</code>\n"
+    "├ ⭐  <b>Rating   :</b>  <code>{rating} / 10</code>\n"
+    "├ 🎭  <b>Genre    :</b>  <code>{genres}</code>\n"
+    "├ 🌍  <b>Country  :</b>  <code>{country}</code>\n"
+    "├ 🗣  <b>Language :</b>  <code>{langs}</code>\n"
+    "├ 📽  <b>Quality  :</b>  <code>{quality}</code>\n"
+    "├ 💾  <b>Size     :</b>  <code>{size_str}</code>\n"
+    "├ ⏱  <b>Runtime  :</b>  <code>{runtime}</code>\n"
+    "{director_line}"
+    "{cast_line}"
+    "╰ 🗂  <b>Source   :</b>  <code>{src}</code>\n"
+    "\n"
+    "📖  <b>Synopsis:</b>\n"
+    "<i>{overview}</i>\n"
+    "</blockquote>\n"
+    "\n"
+    "━━━━━━━━━━━━━━━━━━━━━━━━\n"
+    "{tag_lines}"
+    "<b>{channel_username}</b>\n"
+    '🔔  <a href="{channel_link}">Join for more!</a>'
+)
+
+
+def _compile_template(ctype: str) -> str:
+    """_CAPTION_TMPL with *ctype*'s header and emoji already filled in."""
+    header, media_emoji, flag_emoji = HEADER_MAP[ctype]
+    return (
+        _CAPTION_TMPL
+        .replace("{header}", header)
+        .replace("{media_emoji}", media_emoji)
+        .replace("{flag_emoji}", flag_emoji)
+    )
+
+
+_CAPTION_TEMPLATES: dict[str, str] = {ctype: _compile_template(ctype) for ctype in HEADER_MAP}
+
+CAPTION_MAX   = 1024   # Telegram's media caption limit, in UTF-16 units of visible text
+_SYNOPSIS_MAX = 320
+
+_TAG_RE = re.compile(r"<[^>]+>")
+
+# Optional parts dropped, in this order, when the caption is still too long
+# after the synopsis has been shortened
+_DROPPABLE = ("cast_line", "director_line", "tag_lines")
+
+
+def _esc(value: Any) -> str:
+    return html.escape(str(value), quote=False)
+
+
+def _clip(text: str, limit: int) -> str:
+    """*text* cut to *limit* characters, plus "…" if anything was cut, then escaped."""
+    if len(text) <= limit:
+        return _esc(text)
+    return _esc(text[:max(0, limit)]) + "…"
+
+
+def caption_length(caption: str) -> int:
+    """
+    Length of an HTML caption as Telegram counts it: the text left after
+    entity parsing, in UTF-16 code units (astral emoji and the bold header
+    letters count twice).
+    """
+    text = html.unescape(_TAG_RE.sub("", caption))
+    return len(text.encode("utf-16-le")) // 2
+
+
 def build_caption(
     *,
     content_type: str,
@@ -68,9 +155,15 @@ def build_caption(
     channel_link: str,
     custom_tag: str = "",          # e.g. "⚡ Powered by @MyChannel"
     extra_tags: list[str] | None = None,
+    max_len: int = CAPTION_MAX,
 ) -> str:
     """
-    Assemble the full HTML caption.
+    Assemble the full HTML caption, at most *max_len* long as measured by
+    caption_length.
+
+    Metadata text is HTML-escaped.  An over-long caption is fitted by
+    shortening the synopsis, then dropping cast, director and footer tags,
+    so the markup is never cut mid-tag.
 
     Structure
     ─────────
@@ -96,23 +189,21 @@ def build_caption(
     ━━━
     Powered by / footer
     """
-    h_data = HEADER_MAP.get(content_type, HEADER_MAP["movie"])
-    header, media_emoji, flag_emoji = h_data
+    template = _CAPTION_TEMPLATES.get(content_type) or _CAPTION_TEMPLATES["movie"]
 
-    title    = meta.get("title") or str(guess.get("title") or "Unknown")
+    title    = _esc(meta.get("title") or guess.get("title") or "Unknown")
     year     = meta.get("year") or str(guess.get("year") or "N/A")
     rating   = meta.get("rating", "N/A")
-    genres   = meta.get("genres", "N/A")
+    genres   = _esc(meta.get("genres", "N/A"))
     raw_ov   = meta.get("overview") or "No synopsis available."
-    overview = raw_ov[:320] + ("…" if len(raw_ov) > 320 else "")
     director = meta.get("director", "N/A")
     cast     = meta.get("cast", "N/A")
     runtime  = meta.get("runtime", "N/A")
-    country  = meta.get("country", "N/A")
+    country  = _esc(meta.get("country", "N/A"))
     quality  = resolution_from_guess(guess)
     langs    = detect_languages(guess)
     size_str = format_size(file_size)
-    src      = meta.get("source", "N/A")
+    src      = _esc(meta.get("source", "N/A"))
 
     # Episode info
     season  = guess.get("season")
@@ -123,53 +214,45 @@ def build_caption(
     elif episode:
         ep_str = f"EP {int(episode):02d}"
 
-    lines: list[str] = [
-        f"{header}",
-        "",
-        "<blockquote>",
-        f"<b>{media_emoji}  {title}</b>  {flag_emoji}",
-        "",
-    ]
-
-    if ep_str:
-        lines.append(f"├ 🎞  <b>Episode  :</b>  <code>{ep_str}</code>")
-
-    lines += [
-        f"├ 📅  <b>Year     :</b>  <code>{year}</code>",
-        f"├ ⭐  <b>Rating   :</b>  <code>{rating} / 10</code>",
-        f"├ 🎭  <b>Genre    :</b>  <code>{genres}</code>",
-        f"├ 🌍  <b>Country  :</b>  <code>{country}</code>",
-        f"├ 🗣  <b>Language :</b>  <code>{langs}</code>",
-        f"├ 📽  <b>Quality  :</b>  <code>{quality}</code>",
-        f"├ 💾  <b>Size     :</b>  <code>{size_str}</code>",
-        f"├ ⏱  <b>Runtime  :</b>  <code>{runtime}</code>",
-    ]
-
-    if director and director != "N/A":
-        lines.append(f"├ 🎬  <b>Director :</b>  <code>{director}</code>")
-    if cast and cast != "N/A":
-        lines.append(f"├ 🌟  <b>Cast     :</b>  <code>{cast}</code>")
-
-    lines += [
-        f"╰ 🗂  <b>Source   :</b>  <code>{src}</code>",
-        "",
-        "📖  <b>Synopsis:</b>",
-        f"<i>{overview}</i>",
-        "</blockquote>",
-        "",
-        "━━━━━━━━━━━━━━━━━━━━━━━━",
-    ]
-
     # Footer tags
-    if custom_tag:
-        lines.append(f"<b>{custom_tag}</b>")
+    tags = [custom_tag] if custom_tag else []
     if extra_tags:
-        for tag in extra_tags:
-            lines.append(f"<b>{tag}</b>")
+        tags += extra_tags
+    tag_lines = "".join(f"<b>{tag}</b>\n" for tag in tags)
 
-    lines += [
-        f"<b>{channel_username}</b>",
-        f'🔔  <a href="{channel_link}">Join for more!</a>',
-    ]
+    fields = dict(
+        title=title,
+        episode_line=f"├ 🎞  <b>Episode  :</b>  <code>{ep_str}</code>\n" if ep_str else "",
+        year=year,
+        rating=rating,
+        genres=genres,
+        country=country,
+        langs=langs,
+        quality=quality,
+        size_str=size_str,
+        runtime=runtime,
+        director_line=(
+            f"├ 🎬  <b>Director :</b>  <code>{_esc(director)}</code>\n"
+            if director and director != "N/A" else ""
+        ),
+        cast_line=f"├ 🌟  <b>Cast     :</b>  <code>{_esc(cast)}</code>\n" if cast and cast != "N/A" else "",
+        src=src,
+        overview=_clip(raw_ov, _SYNOPSIS_MAX),
+        tag_lines=tag_lines,
+        channel_username=channel_username,
+        channel_link=channel_link,
+    )
+    caption = template.format_map(fields)
 
-    return "\n".join(lines)
\ No newline at end of file
+    excess = caption_length(caption) - max_len
+    if excess > 0:
+        # Each character cut is at least one unit; the -1 pays for the "…"
+        shown = min(len(raw_ov), _SYNOPSIS_MAX)
+        fields["overview"] = _clip(raw_ov, shown - excess - 1)
+        caption = template.format_map(fields)
+    for key in _DROPPABLE:
+        if caption_length(caption) <= max_len:
+            break
+        fields[key] = ""
+        caption = template.format_map(fields)
+    return caption
@@ -20,14 +20,14 @@ Add TMDB/OMDb keys for even richer movie metadata.
 import os
 import re
 from dataclasses import dataclass, field
-from typing import List
+from typing import FrozenSet
 
 @dataclass(frozen=True)
 class Config:
     # ── Telegram ──────────────────────────────────────────────────────────────
     bot_token: str
     # Comma-separated Telegram user IDs that may use admin commands
-    admin_ids: List[int]
+    admin_ids: FrozenSet[int]
 
     # Default source / target channels (can be overridden via admin commands)
     source_channel_id: int   # negative int  e.g. -1001234567890
@@ -67,7 +67,7 @@ def load_config() -> Config:
 
     raw_admins = opt("ADMIN_IDS", "")
     # Use regex to extract all numbers, allowing various formats like "123, 456", "[123, 456]", "123 456"
-    admin_ids: List[int] = [int(x) for x in re.findall(r'-?\d+', raw_admins)]
+    admin_ids: FrozenSet[int] = frozenset(int(x) for x in re.findall(r'-?\d+', raw_admins))
 
     return Config(
         bot_token=require("BOT_TOKEN"),
@@ -7,11 +7,25 @@ Tables
 settings    key/value store for all runtime bot settings
 post_log    record of every message successfully published
 admins      extra admin user IDs (beyond the config list)
+filters     banned keywords; matching posts are not published
+extra_tags  extra caption tags, in the order they were added
+meta_cache  metadata lookups by Telegram file_unique_id, kept META_TTL seconds
+
+CachedDatabase layers a write-through settings cache over Database and is
+what the bot actually runs with.
 """
 
+from __future__ import annotations
+
+import json
+import logging
+import re
 import sqlite3
 import threading
-from typing import Any, Optional
+import time
+from typing import Any, Iterable, Optional
+
+logger = logging.getLogger(__name__)
 
 
 class Database:
@@ -20,11 +34,17 @@ class Database:
     so the async PTB threads can safely call them from synchronous contexts.
     """
 
+    META_TTL = 30 * 86400   # seconds a cached metadata lookup stays valid
+
     def __init__(self, db_path: str) -> None:
         self._path = db_path
         self._lock = threading.RLock()
         self._conn = sqlite3.connect(db_path, check_same_thread=False)
         self._conn.row_factory = sqlite3.Row
+        self._extra_admins_cache: Optional[frozenset[int]] = None
+        self._extra_tags_cache: Optional[list[str]] = None
+        self._filters_cache: Optional[list[str]] = None
+        self._filters_re: Optional[re.Pattern[str]] = None
         self._migrate()
 
     # ── Schema ────────────────────────────────────────────────────────────────
@@ -34,6 +54,10 @@ class Database:
             cur = self._conn.cursor()
             cur.executescript("""
                 PRAGMA journal_mode=WAL;
+                PRAGMA synchronous=NORMAL;
+                PRAGMA temp_store=MEMORY;
+                PRAGMA cache_size=-20000;
+                PRAGMA wal_autocheckpoint=1000;
 
                 CREATE TABLE IF NOT EXISTS settings (
                     key   TEXT PRIMARY KEY,
@@ -57,7 +81,51 @@ class Database:
                 CREATE TABLE IF NOT EXISTS filters (
                     keyword TEXT PRIMARY KEY
                 );
+
+                CREATE TABLE IF NOT EXISTS extra_tags (
+                    tag TEXT PRIMARY KEY,
+                    pos INTEGER NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS meta_cache (
+                    file_unique_id TEXT PRIMARY KEY,
+                    meta_json      TEXT NOT NULL,
+                    cached_at      INTEGER NOT NULL
+                );
+
+                -- Flags used to be stored as "true"/"false"; set_bool writes 1/0
+                UPDATE settings
+                   SET value = CASE lower(value) WHEN 'true' THEN '1' ELSE '0' END
+                 WHERE key IN ('paused', 'auto_forward')
+                   AND lower(value) IN ('true', 'false');
             """)
+
+            # Extra tags used to live in one "|||"-joined setting
+            row = cur.execute(
+                "SELECT value FROM settings WHERE key = 'extra_tags'"
+            ).fetchone()
+            if row is not None:
+                tags = [t for t in row["value"].split("|||") if t]
+                cur.executemany(
+                    "INSERT OR IGNORE INTO extra_tags (tag, pos) VALUES (?, ?)",
+                    [(t, i) for i, t in enumerate(tags, 1)],
+                )
+                cur.execute("DELETE FROM settings WHERE key = 'extra_tags'")
+
+            # One post_log row per source message; older databases may hold
+            # duplicates, which would block the unique index.
+            if cur.execute(
+                "SELECT 1 FROM sqlite_master WHERE type='index' AND name='idx_post_log_src'"
+            ).fetchone() is None:
+                cur.execute("""
+                    DELETE FROM post_log WHERE id NOT IN (
+                        SELECT MIN(id) FROM post_log GROUP BY source_chat_id, source_msg_id
+                    )
+                """)
+                cur.execute("""
+                    CREATE UNIQUE INDEX idx_post_log_src
+                        ON post_log (source_chat_id, source_msg_id)
+                """)
             self._conn.commit()
 
     # ── Settings ──────────────────────────────────────────────────────────────
@@ -77,6 +145,27 @@ class Database:
             )
             self._conn.commit()
 
+    def set_current_msg_id(self, msg_id: int) -> None:
+        """Queue pointer write — the scheduler's most frequent one, with fixed SQL."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO settings (key, value) VALUES ('current_msg_id', ?)",
+                (str(msg_id),),
+            )
+            self._conn.commit()
+
+    def multi_get(self, keys: Iterable[str]) -> dict[str, str]:
+        """Fetch several settings in one query; missing keys are simply absent."""
+        keys = tuple(keys)
+        if not keys:
+            return {}
+        placeholders = ",".join("?" * len(keys))
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT key, value FROM settings WHERE key IN ({placeholders})", keys
+            ).fetchall()
+            return {r["key"]: r["value"] for r in rows}
+
     def delete(self, key: str) -> None:
         with self._lock:
             self._conn.execute("DELETE FROM settings WHERE key = ?", (key,))
@@ -84,18 +173,106 @@ class Database:
 
     # ── Helpers for typed settings ────────────────────────────────────────────
 
-    def get_int(self, key: str, default: int = 0) -> int:
-        v = self.get(key)
+    @staticmethod
+    def parse_int(v: Any, default: int = 0) -> int:
         try:
             return int(v) if v is not None else default
         except (TypeError, ValueError):
             return default
 
-    def get_bool(self, key: str, default: bool = False) -> bool:
-        v = self.get(key)
+    @staticmethod
+    def parse_bool(v: Any, default: bool = False) -> bool:
         if v is None:
             return default
-        return v.lower() in ("1", "true", "yes")
+        if v == "1" or v == "0":
+            return v == "1"
+        return v.lower() in ("true", "yes")
+
+    def get_int(self, key: str, default: int = 0) -> int:
+        return self.parse_int(self.get(key), default)
+
+    def get_bool(self, key: str, default: bool = False) -> bool:
+        return self.parse_bool(self.get(key), default)
+
+    def set_bool(self, key: str, value: bool) -> None:
+        self.set(key, "1" if value else "0")
+
+    # ── Extra caption tags ────────────────────────────────────────────────────
+
+    def list_tags(self) -> list[str]:
+        with self._lock:
+            if self._extra_tags_cache is None:
+                rows = self._conn.execute(
+                    "SELECT tag FROM extra_tags ORDER BY pos"
+                ).fetchall()
+                self._extra_tags_cache = [r["tag"] for r in rows]
+            return list(self._extra_tags_cache)
+
+    def add_tag(self, tag: str) -> bool:
+        """Append *tag*; False if it was already there."""
+        with self._lock:
+            cur = self._conn.execute(
+                """INSERT OR IGNORE INTO extra_tags (tag, pos)
+                   VALUES (?, (SELECT COALESCE(MAX(pos), 0) + 1 FROM extra_tags))""",
+                (tag,),
+            )
+            self._conn.commit()
+            self._extra_tags_cache = None
+            return cur.rowcount > 0
+
+    def remove_tag(self, tag: str) -> bool:
+        """Delete *tag*; False if there was no such tag."""
+        with self._lock:
+            cur = self._conn.execute("DELETE FROM extra_tags WHERE tag = ?", (tag,))
+            self._conn.commit()
+            self._extra_tags_cache = None
+            return cur.rowcount > 0
+
+    # ── Keyword filters ───────────────────────────────────────────────────────
+
+    def get_filters(self) -> list[str]:
+        with self._lock:
+            if self._filters_cache is None:
+                rows = self._conn.execute(
+                    "SELECT keyword FROM filters ORDER BY keyword"
+                ).fetchall()
+                self._filters_cache = [r["keyword"] for r in rows]
+            return list(self._filters_cache)
+
+    def get_filters_compiled(self) -> Optional[re.Pattern[str]]:
+        """
+        All filter keywords as one case-insensitive alternation, so a message
+        is checked with a single search() and no lower() copy; None when
+        there are no filters.
+        """
+        with self._lock:
+            if self._filters_re is None:
+                words = self.get_filters()
+                if not words:
+                    return None
+                self._filters_re = re.compile("|".join(map(re.escape, words)), re.IGNORECASE)
+            return self._filters_re
+
+    def add_filters(self, keywords: Iterable[str]) -> None:
+        """Insert several keywords in one transaction."""
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO filters (keyword) VALUES (?)",
+                [(k,) for k in keywords],
+            )
+            self._conn.commit()
+            self._filters_cache = None
+            self._filters_re    = None
+
+    def add_filter(self, keyword: str) -> None:
+        self.add_filters((keyword,))
+
+    def remove_filter(self, keyword: str) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM filters WHERE keyword = ?", (keyword,))
+            self._conn.commit()
+            self._filters_cache = None
+            self._filters_re    = None
 
     # ── Post log ──────────────────────────────────────────────────────────────
 
@@ -107,14 +284,22 @@ class Database:
         target_msg_id: Optional[int],
         filename: str = "",
     ) -> None:
+        self.log_posts([(source_chat_id, source_msg_id, target_chat_id, target_msg_id, filename)])
+
+    def log_posts(self, rows: list[tuple]) -> None:
+        """Insert several log_post() rows in one transaction."""
         with self._lock:
-            self._conn.execute(
-                """INSERT INTO post_log
-                   (source_chat_id, source_msg_id, target_chat_id, target_msg_id, filename)
-                   VALUES (?, ?, ?, ?, ?)""",
-                (source_chat_id, source_msg_id, target_chat_id, target_msg_id, filename),
-            )
-            self._conn.commit()
+            try:
+                self._conn.executemany(
+                    """INSERT OR IGNORE INTO post_log
+                       (source_chat_id, source_msg_id, target_chat_id, target_msg_id, filename)
+                       VALUES (?, ?, ?, ?, ?)""",
+                    rows,
+                )
+                self._conn.commit()
+            except sqlite3.Error:
+                self._conn.rollback()
+                raise
 
     def total_posted(self) -> int:
         with self._lock:
@@ -128,6 +313,14 @@ class Database:
             ).fetchone()
             return row["posted_at"] if row else None
 
+    def post_summary(self) -> tuple[int, Optional[str]]:
+        """(total_posted(), last_post_time()) in one query."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT COUNT(*) AS n, MAX(posted_at) AS last FROM post_log"
+            ).fetchone()
+            return row["n"], row["last"]
+
     def was_posted(self, source_chat_id: int, source_msg_id: int) -> bool:
         with self._lock:
             row = self._conn.execute(
@@ -136,6 +329,35 @@ class Database:
             ).fetchone()
             return row is not None
 
+    def was_posted_bulk(self, source_chat_id: int, first: int, last: int) -> set[int]:
+        """Source msg IDs in [first, last] that are already in post_log."""
+        with self._lock:
+            rows = self._conn.execute(
+                """SELECT source_msg_id FROM post_log
+                   WHERE source_chat_id=? AND source_msg_id BETWEEN ? AND ?""",
+                (source_chat_id, first, last),
+            ).fetchall()
+            return {r["source_msg_id"] for r in rows}
+
+    # ── Metadata cache ────────────────────────────────────────────────────────
+
+    def get_cached_meta(self, file_unique_id: str) -> Optional[dict[str, Any]]:
+        """Metadata stored for this file within META_TTL, else None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT meta_json FROM meta_cache WHERE file_unique_id = ? AND cached_at >= ?",
+                (file_unique_id, int(time.time()) - self.META_TTL),
+            ).fetchone()
+            return json.loads(row["meta_json"]) if row else None
+
+    def cache_meta(self, file_unique_id: str, meta: dict[str, Any]) -> None:
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO meta_cache (file_unique_id, meta_json, cached_at) VALUES (?, ?, ?)",
+                (file_unique_id, json.dumps(meta, default=str), int(time.time())),
+            )
+            self._conn.commit()
+
     # ── Extra admins ──────────────────────────────────────────────────────────
 
     def add_admin(self, user_id: int) -> None:
@@ -144,17 +366,157 @@ class Database:
                 "INSERT OR IGNORE INTO admins (user_id) VALUES (?)", (user_id,)
             )
             self._conn.commit()
+            if self._extra_admins_cache is not None:
+                self._extra_admins_cache |= {user_id}
 
     def remove_admin(self, user_id: int) -> None:
         with self._lock:
             self._conn.execute("DELETE FROM admins WHERE user_id = ?", (user_id,))
             self._conn.commit()
+            if self._extra_admins_cache is not None:
+                self._extra_admins_cache -= {user_id}
 
     def extra_admins(self) -> list[int]:
         with self._lock:
             rows = self._conn.execute("SELECT user_id FROM admins").fetchall()
             return [r["user_id"] for r in rows]
 
+    def extra_admin_set(self) -> frozenset[int]:
+        """Cached frozenset of extra_admins(); add_admin/remove_admin update it in place."""
+        with self._lock:
+            if self._extra_admins_cache is None:
+                self._extra_admins_cache = frozenset(self.extra_admins())
+            return self._extra_admins_cache
+
+    # ── Maintenance ───────────────────────────────────────────────────────────
+
+    def maintenance(self) -> None:
+        """
+        Drop expired meta_cache rows, refresh planner statistics and fold
+        the WAL back into the main file.
+        """
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM meta_cache WHERE cached_at < ?",
+                (int(time.time()) - self.META_TTL,),
+            )
+            self._conn.commit()
+            self._conn.execute("PRAGMA optimize")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
     def close(self) -> None:
         with self._lock:
             self._conn.close()
+
+
+class CachedDatabase(Database):
+    """
+    Database with a write-through settings cache.
+
+    Settings only change through this object (admin commands), and the
+    table is a few dozen rows, so it is loaded whole in one SELECT at
+    start-up; get()/multi_get() never query SQLite and set()/delete()
+    update the cache in place.  The source_msg_ids of post_log are loaded
+    the same way, as one set per source chat, and extended by log_post(),
+    so was_posted() never queries SQLite either.
+
+    log_post() is write-behind: rows are buffered and written in one
+    transaction by flush_posts(), which the bot calls every FLUSH_EVERY
+    seconds, once FLUSH_AT rows are pending, before any post_log read, and
+    on close().
+    """
+
+    FLUSH_EVERY = 1.0
+    FLUSH_AT    = 100
+
+    def __init__(self, db_path: str) -> None:
+        super().__init__(db_path)
+        with self._lock:
+            settings = self._conn.execute("SELECT key, value FROM settings").fetchall()
+            posted = self._conn.execute(
+                "SELECT source_chat_id, source_msg_id FROM post_log"
+            ).fetchall()
+        self._settings: dict[str, str] = {r[0]: r[1] for r in settings}
+        self._pending_posts: list[tuple] = []
+        self._posted: dict[int, set[int]] = {}
+        for chat_id, msg_id in posted:
+            self._posted.setdefault(chat_id, set()).add(msg_id)
+
+    # ── Settings ──────────────────────────────────────────────────────────────
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self._settings.get(key, default)
+
+    def set(self, key: str, value: Any) -> None:
+        with self._lock:
+            super().set(key, value)
+            self._settings[key] = str(value)
+
+    def multi_get(self, keys: Iterable[str]) -> dict[str, str]:
+        settings = self._settings
+        return {k: settings[k] for k in keys if k in settings}
+
+    def set_current_msg_id(self, msg_id: int) -> None:
+        with self._lock:
+            super().set_current_msg_id(msg_id)
+            self._settings["current_msg_id"] = str(msg_id)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            super().delete(key)
+            self._settings.pop(key, None)
+
+    # ── Post log ──────────────────────────────────────────────────────────────
+
+    def log_post(
+        self,
+        source_chat_id: int,
+        source_msg_id: int,
+        target_chat_id: int,
+        target_msg_id: Optional[int],
+        filename: str = "",
+    ) -> None:
+        with self._lock:
+            self._pending_posts.append(
+                (source_chat_id, source_msg_id, target_chat_id, target_msg_id, filename)
+            )
+            self._posted.setdefault(source_chat_id, set()).add(source_msg_id)
+            if len(self._pending_posts) >= self.FLUSH_AT:
+                try:
+                    self.flush_posts()
+                except sqlite3.Error as exc:
+                    # The rows stay buffered for the next periodic flush
+                    logger.warning("post_log flush failed: %s", exc)
+
+    def flush_posts(self) -> None:
+        """Write buffered log_post() rows; they stay buffered if the write fails."""
+        with self._lock:
+            if self._pending_posts:
+                self.log_posts(self._pending_posts)
+                self._pending_posts = []
+
+    def total_posted(self) -> int:
+        self.flush_posts()
+        return super().total_posted()
+
+    def last_post_time(self) -> Optional[str]:
+        self.flush_posts()
+        return super().last_post_time()
+
+    def post_summary(self) -> tuple[int, Optional[str]]:
+        self.flush_posts()
+        return super().post_summary()
+
+    def close(self) -> None:
+        self.flush_posts()
+        super().close()
+
+    def was_posted(self, source_chat_id: int, source_msg_id: int) -> bool:
+        posted = self._posted.get(source_chat_id)
+        return posted is not None and source_msg_id in posted
+
+    def was_posted_bulk(self, source_chat_id: int, first: int, last: int) -> set[int]:
+        posted = self._posted.get(source_chat_id)
+        if not posted:
+            return set()
+        return posted.intersection(range(first, last + 1))
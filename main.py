@@ -15,12 +15,15 @@ This flow produces zero-download Telegram copy with a rich HTML caption.
 from __future__ import annotations
 
 import asyncio
+import atexit
 import logging
 import os
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
 
-from aiohttp import web
+from aiohttp import AsyncResolver, ClientSession, TCPConnector, web
 from dotenv import load_dotenv
 from telegram import Update
 from telegram.constants import ParseMode
@@ -31,20 +34,49 @@ from telegram.ext import (
     filters,
 )
 
-from admin import _publisher_job_callback, register_admin_handlers
+from admin import (
+    _footer_channel,
+    _is_autolive,
+    _is_paused,
+    publish_command_menu,
+    register_admin_handlers,
+    schedule_publisher,
+)
 from config import Config, load_config
-from database import Database
-from publisher import publish_media_message
+from database import CachedDatabase, Database
+from publisher import _extract_media, blocked_by, is_transient, publish_media_message, retry_delay
+
+try:
+    import aiodns  # noqa: F401  – optional, part of aiohttp[speedups]
+    _HAVE_AIODNS = True
+except ImportError:
+    _HAVE_AIODNS = False
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Logging
 # ─────────────────────────────────────────────────────────────────────────────
 
-logging.basicConfig(
-    format="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
-    level=logging.INFO,
-    stream=sys.stdout,
-)
+# The format uses none of these; skip collecting them for every record
+logging.logThreads         = False
+logging.logProcesses       = False
+logging.logMultiprocessing = False
+
+_log_handler = logging.StreamHandler(sys.stdout)
+_log_handler.setFormatter(logging.Formatter(
+    "%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
+    datefmt="%Y-%m-%d %H:%M:%S",   # whole seconds: no per-record msecs formatting
+))
+
+# Log calls only queue the record; a listener thread formats
+# and writes them, so a slow stdout never stalls the event loop
+_log_queue: queue.SimpleQueue = queue.SimpleQueue()
+_log_listener = QueueListener(_log_queue, _log_handler)
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
+_queue_handler = QueueHandler(_log_queue)
+_queue_handler.setFormatter(logging.Formatter("%(message)s"))   # args merged; _log_handler adds the rest
+logging.basicConfig(level=logging.INFO, handlers=[_queue_handler])
 logger = logging.getLogger(__name__)
 
 # Silence noisy loggers
@@ -65,11 +97,11 @@ async def handle_source_message(update: Update, context: ContextTypes.DEFAULT_TY
     db:  Database = context.bot_data["db"]
 
     # 1. Master pauses
-    if db.get_bool("paused", False):
+    if _is_paused(context.bot_data):
         return
 
     # 2. Real-time toggle
-    if not db.get_bool("auto_forward", False):
+    if not _is_autolive(context.bot_data):
         return
 
     msg = update.channel_post or update.message
@@ -98,35 +130,111 @@ async def handle_source_message(update: Update, context: ContextTypes.DEFAULT_TY
         return
 
     # 3. Check Filters
-    banned_words = db.get_filters()
-    if banned_words:
-        from publisher import _extract_media
+    banned = db.get_filters_compiled()
+    if banned is not None:
         media_info = _extract_media(msg)
-        caption_text = (msg.caption or msg.text or "").lower()
-        file_name = (media_info[1] if media_info else "").lower()
-        search_str = f"{caption_text} {file_name}"
-
-        for word in banned_words:
-            if word in search_str:
-                logger.info("Real-time msg %d blocked by filter: '%s'", msg.message_id, word)
-                return
+        caption_text = msg.caption or msg.text or ""
+        file_name = media_info[1] if media_info else ""
+        word = blocked_by(f"{caption_text} {file_name}", banned)
+        if word is not None:
+            logger.info("Real-time msg %d blocked by filter: '%s'", msg.message_id, word)
+            return
 
     custom_tag = db.get("custom_tag", "")
-    extra_tags = [t for t in (db.get("extra_tags") or "").split("|||") if t]
+    extra_tags = db.list_tags()
+    channel_username, channel_link = _footer_channel(context.bot_data)
 
-    await publish_media_message(
+    # 4. Hand off to the chat's publish worker so the update loop is free at once
+    queued = enqueue_publish(context.bot_data, msg.chat_id, dict(
         bot=context.bot,
         msg=msg,
         target_chat_id=target_chat_id,
         tmdb_api_key=cfg.tmdb_api_key,
         omdb_api_key=cfg.omdb_api_key,
         api_timeout=cfg.api_timeout,
-        channel_username=db.get("channel_username") or cfg.channel_username,
-        channel_link=db.get("channel_link") or cfg.channel_link,
+        channel_username=channel_username,
+        channel_link=channel_link,
         custom_tag=custom_tag,
         extra_tags=extra_tags,
         db=db,
-    )
+        http=context.bot_data.get("http"),
+    ))
+    if not queued:
+        logger.warning("Publish queue full, dropping real-time msg %d", msg.message_id)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Real-time publish workers  –  one ordered queue per source chat
+# ─────────────────────────────────────────────────────────────────────────────
+
+_PUBLISH_QUEUE_MAX   = 100
+_PUBLISH_IDLE        = 300   # seconds a worker waits for work before exiting
+_PUBLISH_CONCURRENCY = 16    # publishes in flight across all chats; well under connection_pool_size
+_PUBLISH_RETRIES     = 3     # extra attempts after a flood-wait / network error
+
+
+def enqueue_publish(bot_data: dict, chat_id: int, item: dict) -> bool:
+    """
+    Queue publish_media_message(**item) behind earlier posts from the same
+    chat, starting that chat's worker if it is not running.  False if the
+    queue is full.
+    """
+    workers: dict[int, tuple[asyncio.Queue, asyncio.Task]] = bot_data.setdefault("_publish_workers", {})
+    entry = workers.get(chat_id)
+    if entry is None:
+        slots: asyncio.Semaphore = bot_data.setdefault("_publish_slots", asyncio.Semaphore(_PUBLISH_CONCURRENCY))
+        queue: asyncio.Queue = asyncio.Queue(maxsize=_PUBLISH_QUEUE_MAX)
+        # Not Application.create_task: stop() waits for those
+        entry = workers[chat_id] = (queue, asyncio.create_task(publish_worker(workers, chat_id, queue, slots)))
+    try:
+        entry[0].put_nowait(item)
+    except asyncio.QueueFull:
+        return False
+    return True
+
+
+async def publish_worker(
+    workers: dict,
+    chat_id: int,
+    queue: asyncio.Queue,
+    slots: asyncio.Semaphore,
+) -> None:
+    """
+    Drain one chat's publishes in order; other chats have their own worker
+    and run concurrently, at most _PUBLISH_CONCURRENCY at a time (*slots*),
+    so a burst queues here rather than exhausting the Bot API connection
+    pool.  A transient failure (flood-wait, timeout) is retried after
+    retry_delay, holding back the rest of this chat's queue so order is
+    kept; any other failure is logged and the worker moves on.  After
+    _PUBLISH_IDLE seconds without work it removes itself.
+    """
+    while True:
+        try:
+            item = await asyncio.wait_for(queue.get(), _PUBLISH_IDLE)
+        except asyncio.TimeoutError:
+            if queue.empty():
+                del workers[chat_id]
+                return
+            continue
+        try:
+            for attempt in range(_PUBLISH_RETRIES + 1):
+                try:
+                    async with slots:
+                        await publish_media_message(**item)
+                    break
+                except Exception as exc:
+                    if not is_transient(exc) or attempt == _PUBLISH_RETRIES:
+                        raise
+                    delay = retry_delay(exc, attempt + 1)
+                    logger.warning(
+                        "Real-time msg %d: %s — retry #%d in %.0f s.",
+                        item["msg"].message_id, exc, attempt + 1, delay,
+                    )
+                    await asyncio.sleep(delay)
+        except Exception:
+            logger.exception("Real-time publish of msg %d failed", item["msg"].message_id)
+        finally:
+            queue.task_done()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -145,6 +253,23 @@ async def start_dummy_server() -> None:
     logger.info("Dummy web server started on port %d", port)
 
 
+async def db_maintenance(context: ContextTypes.DEFAULT_TYPE) -> None:
+    """Hourly job: keep post_log statistics fresh and the WAL file small."""
+    db: Database = context.bot_data["db"]
+    db.maintenance()
+
+
+async def flush_post_log(db: CachedDatabase) -> None:
+    """Write buffered post_log rows every CachedDatabase.FLUSH_EVERY seconds."""
+    while True:
+        await asyncio.sleep(db.FLUSH_EVERY)
+        try:
+            db.flush_posts()
+        except Exception as exc:
+            # Rows stay buffered; the next tick retries them
+            logger.warning("post_log flush failed: %s", exc)
+
+
 async def post_init(application: Application) -> None:
     """Called once after the Application is initialised."""
     # Start the dummy web server as an asyncio task
@@ -153,15 +278,31 @@ async def post_init(application: Application) -> None:
     db:  Database = application.bot_data["db"]
     cfg: Config   = application.bot_data["config"]
 
+    await publish_command_menu(application)
+
+    # One pooled HTTP session for every metadata lookup
+    application.bot_data["http"] = ClientSession(
+        # Keep idle TLS connections past aiohttp's 15 s default so lookups a
+        # minute apart still skip the handshake.  The handful of API hosts
+        # stay in the DNS cache for 10 min, resolved on the loop by aiodns
+        # when it is installed instead of in a thread-pool getaddrinfo.
+        connector=TCPConnector(
+            limit=16,
+            ttl_dns_cache=600,
+            keepalive_timeout=60,
+            resolver=AsyncResolver() if _HAVE_AIODNS else None,
+        ),
+    )
+
+    # Not Application.create_task: stop() waits for those
+    application.bot_data["_log_flusher"] = asyncio.create_task(flush_post_log(db))
+
     interval = db.get_int("interval_seconds", 600)
     jq = application.job_queue
     if jq:
-        jq.run_repeating(
-            _publisher_job_callback,
-            interval=interval,
-            first=10,        # first run 10 s after startup
-            name="publisher_job",
-        )
+        # first run 10 s after startup
+        schedule_publisher(jq, application.bot_data, interval, first=10)
+        jq.run_repeating(db_maintenance, interval=3600, first=3600, name="db_maint")
         logger.info("Scheduler started: posting every %d s", interval)
     else:
         logger.warning(
@@ -176,17 +317,43 @@ async def post_init(application: Application) -> None:
     )
 
 
+async def post_shutdown(application: Application) -> None:
+    """Called once after the Application has stopped."""
+    for _, worker in application.bot_data.pop("_publish_workers", {}).values():
+        worker.cancel()
+    http: ClientSession | None = application.bot_data.pop("http", None)
+    if http is not None:
+        await http.close()
+    flusher: asyncio.Task | None = application.bot_data.pop("_log_flusher", None)
+    if flusher is not None:
+        flusher.cancel()
+    db: CachedDatabase = application.bot_data["db"]
+    db.flush_posts()
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Application builder
 # ─────────────────────────────────────────────────────────────────────────────
 
+_POLL_TIMEOUT = 30   # seconds Telegram holds each getUpdates long poll
+
+
 def build_application(cfg: Config) -> Application:
-    db = Database(cfg.db_path)
+    db = CachedDatabase(cfg.db_path)
 
     app = (
         Application.builder()
         .token(cfg.bot_token)
+        # Bot API calls from concurrent handlers, publish workers and jobs
+        .connection_pool_size(64)
+        .pool_timeout(10.0)
+        .concurrent_updates(64)
+        # getUpdates is held open up to _POLL_TIMEOUT s; give it room on top
+        .get_updates_read_timeout(_POLL_TIMEOUT + 5)
+        .get_updates_connect_timeout(15)
+        .get_updates_pool_timeout(5)
         .post_init(post_init)
+        .post_shutdown(post_shutdown)
         .build()
     )
 
@@ -239,7 +406,12 @@ def main() -> None:
     logger.info("Starting Movie Publisher Bot (polling)…")
     app.run_polling(
         allowed_updates=["message", "channel_post", "callback_query"],
-        drop_pending_updates=True,
+        # Posts made while the bot was down are exactly what it should publish;
+        # handle_source_message skips anything already in post_log
+        drop_pending_updates=False,
+        timeout=_POLL_TIMEOUT,
+        poll_interval=0.0,
+        bootstrap_retries=-1,
     )
 
 
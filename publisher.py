@@ -17,18 +17,22 @@ Core flow
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from pathlib import Path
+import re
+import time
+from functools import lru_cache
 from typing import Any
 
+import aiohttp
 import guessit
 from telegram import Bot, Message
 from telegram.constants import ParseMode
-from telegram.error import TelegramError
+from telegram.error import BadRequest, NetworkError, RetryAfter, TelegramError, TimedOut
 
 from caption import HEADER_MAP, build_caption, detect_content_type
 from database import Database
-from utils import fetch_smart_metadata, pre_clean_filename
+from utils import fetch_smart_metadata, file_stem, pre_clean_filename
 
 logger = logging.getLogger(__name__)
 
@@ -37,185 +41,413 @@ logger = logging.getLogger(__name__)
 # Helpers
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _extract_media(msg: Message) -> tuple[str, str, int | None, str] | None:
+def is_transient(exc: BaseException) -> bool:
     """
-    Pull (file_id, filename, file_size, media_kind) from any media message.
+    Flood-wait, timeout or connection trouble — worth retrying the same
+    message later.  BadRequest subclasses NetworkError in PTB but is final.
+    """
+    if isinstance(exc, (RetryAfter, TimedOut)):
+        return True
+    return isinstance(exc, NetworkError) and not isinstance(exc, BadRequest)
+
+
+_BACKOFF_BASE = 5     # seconds; doubles per consecutive transient failure
+_BACKOFF_MAX  = 300
+
+
+def retry_delay(exc: BaseException, retries: int) -> float:
+    """
+    Seconds to wait before retry number *retries* after a transient *exc*:
+    Telegram's flood-wait when it gives one, else exponential backoff.
+    """
+    delay = getattr(exc, "retry_after", None)
+    if delay is None:
+        return float(min(_BACKOFF_BASE * 2 ** (retries - 1), _BACKOFF_MAX))
+    if hasattr(delay, "total_seconds"):
+        delay = delay.total_seconds()
+    return float(delay)
+
+
+_UNSAFE_FILENAME_RE = re.compile(r'[\\/*?:"<>|]')
+
+# Message attribute / media_kind, extension for a caption-derived name,
+# placeholder-name prefix, extension for a file_unique_id-derived name,
+# whether names containing "unknown" are also treated as placeholders
+_MEDIA_SPECS: tuple[tuple[str, str, str, str, bool], ...] = (
+    ("video",     ".mp4", "video_", ".mp4", True),
+    ("document",  ".mkv", "doc_",   "",     True),
+    ("audio",     ".mp3", "audio_", ".mp3", False),
+    ("animation", ".gif", "anim_",  ".gif", False),
+)
+
+
+def _extract_media(msg: Message) -> tuple[str, str, int | None, str, str] | None:
+    """
+    Pull (file_id, filename, file_size, media_kind, file_unique_id) from any
+    media message.
     Returns None if the message has no supported media.
     """
     caption_hint = ""
     if getattr(msg, "caption", None):
-        caption_hint = msg.caption.split('\n')[0].strip()
+        caption_hint = msg.caption.partition('\n')[0].strip()
         # Remove any unwanted characters from caption_hint to make it a generic filename
-        import re
-        caption_hint = re.sub(r'[\\/*?:"<>|]', "", caption_hint)[:60]
-
-    if msg.video:
-        v = msg.video
-        fn = getattr(v, "file_name", "") or ""
-        if not fn or fn.startswith("video_") or "unknown" in fn.lower():
-            fn = (caption_hint + ".mp4") if caption_hint else f"video_{v.file_unique_id}.mp4"
-        return v.file_id, fn, v.file_size, "video"
-    if msg.document:
-        d = msg.document
-        fn = getattr(d, "file_name", "") or ""
-        if not fn or fn.startswith("doc_") or "unknown" in fn.lower():
-            fn = (caption_hint + ".mkv") if caption_hint else f"doc_{d.file_unique_id}"
-        return d.file_id, fn, d.file_size, "document"
-    if msg.audio:
-        a = msg.audio
-        fn = getattr(a, "file_name", "") or ""
-        if not fn or fn.startswith("audio_"):
-            fn = (caption_hint + ".mp3") if caption_hint else f"audio_{a.file_unique_id}.mp3"
-        return a.file_id, fn, a.file_size, "audio"
-    if msg.animation:
-        an = msg.animation
-        fn = getattr(an, "file_name", "") or ""
-        if not fn or fn.startswith("anim_"):
-            fn = (caption_hint + ".gif") if caption_hint else f"anim_{an.file_unique_id}.gif"
-        return an.file_id, fn, an.file_size, "animation"
+        caption_hint = _UNSAFE_FILENAME_RE.sub("", caption_hint)[:60]
+
+    for kind, hint_ext, prefix, fallback_ext, unknown_too in _MEDIA_SPECS:
+        media = getattr(msg, kind)
+        if not media:
+            continue
+        fn = getattr(media, "file_name", "") or ""
+        if not fn or fn.startswith(prefix) or (unknown_too and "unknown" in fn.lower()):
+            fn = (caption_hint + hint_ext) if caption_hint else f"{prefix}{media.file_unique_id}{fallback_ext}"
+        return media.file_id, fn, media.file_size, kind, media.file_unique_id
     return None
 
 
-# ─────────────────────────────────────────────────────────────────────────────
-# Main publisher coroutine
-# ─────────────────────────────────────────────────────────────────────────────
+@lru_cache(maxsize=1024)
+def _guess(filename: str) -> dict[str, Any]:
+    """
+    guessit over the cleaned *filename*.  Release names repeat a lot during
+    backfills, so results are memoised; callers must copy before mutating.
+    """
+    cleaned = pre_clean_filename(filename) if filename else "Unknown"
+    try:
+        return dict(guessit.guessit(cleaned))
+    except Exception:
+        return {}
 
-async def publish_message(
+
+async def _metadata(unique_id: str, db: Database | None, **lookup: Any) -> dict[str, Any]:
+    """
+    fetch_smart_metadata(**lookup), served from the meta_cache table when
+    the same file (by file_unique_id) was looked up before.  Only real hits
+    are stored; a miss may be a provider outage and is left to the short
+    negative TTL of the provider memo.
+    """
+    if db is not None:
+        cached = db.get_cached_meta(unique_id)
+        if cached is not None:
+            return cached
+    meta = await fetch_smart_metadata(**lookup)
+    if db is not None and meta["source"] != "None":
+        db.cache_meta(unique_id, meta)
+    return meta
+
+
+# _describe() result for a message a keyword filter blocks
+_BLOCKED = object()
+
+
+async def _describe(
+    msg: Message,
     *,
-    bot: Bot,
-    source_chat_id: int,
-    source_msg_id: int,
-    target_chat_id: int,
-    tmdb_api_key: str = "",
-    omdb_api_key: str = "",
-    api_timeout: int = 10,
-    channel_username: str = "@YourChannel",
-    channel_link: str = "https://t.me/YourChannel",
-    custom_tag: str = "",
-    extra_tags: list[str] | None = None,
+    tmdb_api_key: str,
+    omdb_api_key: str,
+    api_timeout: int,
+    http: aiohttp.ClientSession | None = None,
     db: Database | None = None,
-) -> bool:
+    banned: re.Pattern[str] | None = None,
+) -> Any:
     """
-    Forward one media message from source → target with a rich caption.
-    Returns True on success, False on failure.
+    Everything publish_message needs to know about a source message:
+    (file_id, filename, file_size, media_kind, ctype, guess, meta, search),
+    where search is the caption + filename text that keyword filters
+    are matched against.  Returns None if the message has no supported media,
+    and _BLOCKED, before guessit or any API lookup runs, if *banned* matches.
     """
-    # ── 1. Fetch the source message by forwarding temporarily ──
-    try:
-        temp_msg: Message = await bot.forward_message(
-            chat_id=target_chat_id,
-            from_chat_id=source_chat_id,
-            message_id=source_msg_id,
-            disable_notification=True,
-        )
-    except TelegramError as exc:
-        logger.warning(
-            "Could not forward msg %d from %s: %s — skipping or trying fallback",
-            source_msg_id, source_chat_id, exc
-        )
-        # Attempt simple copy_message if forward fails (no rich metadata)
-        try:
-            sent = await bot.copy_message(
-                chat_id=target_chat_id,
-                from_chat_id=source_chat_id,
-                message_id=source_msg_id,
-                parse_mode=ParseMode.HTML,
-            )
-            if db:
-                db.log_post(source_chat_id, source_msg_id, target_chat_id, sent.message_id)
-            return True
-        except TelegramError as exc2:
-            logger.error("copy_message also failed for msg %d: %s", source_msg_id, exc2)
-            return False
-
-    # ── 2. Extract media info ──
-    media_info = _extract_media(temp_msg)
-    
+    media_info = _extract_media(msg)
     if not media_info:
-        # Not a media msg. Just keep the forward or send basic message.
-        try:
-            await temp_msg.delete()
-        except TelegramError:
-            pass
-        return True
+        return None
 
-    file_id, filename, file_size, media_kind = media_info
+    file_id, filename, file_size, media_kind, unique_id = media_info
+    search = f"{msg.caption or msg.text or ''} {filename}"
 
-    # ── 3. Build Metadata & Caption ──
-    cleaned   = pre_clean_filename(filename) if filename else "Unknown"
-    try:
-        guess: dict[str, Any] = dict(guessit.guessit(cleaned))
-    except Exception:
-        guess = {}
+    word = blocked_by(search, banned)
+    if word is not None:
+        logger.info("'%s' blocked by filter: '%s'", filename, word)
+        return _BLOCKED
+
+    # guessit is pure-Python parsing: keep it off the event loop
+    guess: dict[str, Any] = dict(await asyncio.to_thread(_guess, filename))
 
-    raw_title  = str(guess.get("title") or Path(filename).stem if filename else "Unknown")
+    raw_title  = str(guess.get("title") or file_stem(filename) if filename else "Unknown")
     raw_year   = int(guess.get("year")) if guess.get("year") else None
     ctype      = detect_content_type(filename or "", guess)
 
     try:
-        meta = await fetch_smart_metadata(
+        meta = await _metadata(
+            unique_id,
+            db,
             title=raw_title,
             year=raw_year,
             content_type=ctype,
             tmdb_api_key=tmdb_api_key,
             omdb_api_key=omdb_api_key,
             timeout=api_timeout,
+            session=http,
         )
     except Exception as exc:
         logger.error("Caption metadata fetch failed: %s", exc)
         meta = {}
 
-    caption = build_caption(
-        content_type=ctype,
-        meta=meta,
-        guess=guess,
-        file_size=file_size,
-        channel_username=channel_username,
-        channel_link=channel_link,
-        custom_tag=custom_tag,
-        extra_tags=extra_tags,
-    )[:1024]
+    return file_id, filename, file_size, media_kind, ctype, guess, meta, search
+
+
+# media_kind → Bot method, each taking (chat_id, file) first; anything else is a document
+_SEND_FN: dict[str, str] = {
+    "video":     "send_video",
+    "audio":     "send_audio",
+    "animation": "send_animation",
+    "document":  "send_document",
+}
+
+
+async def _send_media(bot: Bot, media_kind: str, chat_id: int, file_id: str, caption: str) -> Message:
+    """Re-send *file_id* to *chat_id* with an HTML *caption*, using the method matching *media_kind*."""
+    method = getattr(bot, _SEND_FN.get(media_kind, "send_document"))
+    return await method(chat_id, file_id, caption=caption, parse_mode=ParseMode.HTML)
 
-    # ── 4. Delete the temp forwarded message ──
+
+async def _delete_quietly(msg: Message) -> None:
+    """Delete a temporary forward; it is gone or undeletable either way."""
     try:
-        await temp_msg.delete()
+        await msg.delete()
     except TelegramError:
         pass
 
-    # ── 5. Send properly with file_id ──
-    send_kwargs = {
-        "chat_id": target_chat_id,
-        "caption": caption,
-        "parse_mode": ParseMode.HTML,
-    }
 
-    sent_msg: Message | None = None
+def blocked_by(search: str, banned: re.Pattern[str] | None) -> str | None:
+    """
+    The banned keyword found in *search* (any case), or None.
+    *banned* is Database.get_filters_compiled().
+    """
+    if banned is None:
+        return None
+    m = banned.search(search)
+    return m.group(0).lower() if m else None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Send throttling  –  stay under Telegram's flood limits
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TokenBucket:
+    """Async token bucket: *rate* tokens per second, bursts of up to *capacity*."""
+
+    def __init__(self, rate: float, capacity: float) -> None:
+        self._rate     = rate
+        self._capacity = capacity
+        self._tokens   = capacity
+        self._stamp    = time.monotonic()
+        self._lock     = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(self._capacity, self._tokens + (now - self._stamp) * self._rate)
+                self._stamp  = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+
+
+# Telegram allows ~30 messages/s per bot and ~20/min into one group or
+# channel; stay a little under the global cap so retries have headroom
+_SEND_BUCKET = TokenBucket(rate=25, capacity=25)
+_chat_buckets: dict[int | str, TokenBucket] = {}
+
+
+async def _throttle(chat_id: int | str) -> None:
+    """Wait until one more message may be sent into *chat_id*."""
+    bucket = _chat_buckets.get(chat_id)
+    if bucket is None:
+        bucket = _chat_buckets[chat_id] = TokenBucket(rate=20 / 60, capacity=20)
+    await bucket.acquire()
+    await _SEND_BUCKET.acquire()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Prefetch  –  describe the next queued message while the current one waits
+# ─────────────────────────────────────────────────────────────────────────────
+
+_PREFETCH_MAX = 4
+_prefetched: dict[tuple[int | str, int], asyncio.Task] = {}
+
+# Prefetch result when publish_message must forward the message itself
+_NOT_PREFETCHED = object()
+
+
+async def _prefetch(
+    bot: Bot,
+    source_chat_id: int | str,
+    source_msg_id: int,
+    target_chat_id: int | str,
+    **api: Any,
+) -> Any:
+    await _throttle(target_chat_id)
     try:
-        if media_kind == "video":
-            sent_msg = await bot.send_video(video=file_id, **send_kwargs)
-        elif media_kind == "audio":
-            sent_msg = await bot.send_audio(audio=file_id, **send_kwargs)
-        elif media_kind == "animation":
-            sent_msg = await bot.send_animation(animation=file_id, **send_kwargs)
-        else:
-            sent_msg = await bot.send_document(document=file_id, **send_kwargs)
-    except TelegramError as exc:
-        logger.error("Primary send failed for '%s': %s — falling back to copy_message", filename, exc)
+        temp_msg: Message = await bot.forward_message(
+            chat_id=target_chat_id,
+            from_chat_id=source_chat_id,
+            message_id=source_msg_id,
+            disable_notification=True,
+        )
+    except TelegramError:
+        return _NOT_PREFETCHED
+    delete_task = asyncio.create_task(_delete_quietly(temp_msg))
+    try:
+        return await _describe(temp_msg, **api)
+    finally:
+        await delete_task
+
+
+def prefetch_message(
+    *,
+    bot: Bot,
+    source_chat_id: int | str,
+    source_msg_id: int,
+    target_chat_id: int | str,
+    tmdb_api_key: str = "",
+    omdb_api_key: str = "",
+    api_timeout: int = 10,
+    http: aiohttp.ClientSession | None = None,
+    db: Database | None = None,
+    banned: re.Pattern[str] | None = None,
+) -> None:
+    """
+    Start describing a message in the background so that the publish_message
+    call for it skips the forward and the metadata lookups.  A message that
+    *banned* blocks gets no lookups at all.  At most _PREFETCH_MAX results
+    are kept; the oldest is dropped first.
+    """
+    key = (source_chat_id, source_msg_id)
+    if key in _prefetched:
+        return
+    while len(_prefetched) >= _PREFETCH_MAX:
+        _prefetched.pop(next(iter(_prefetched))).cancel()
+    _prefetched[key] = asyncio.create_task(_prefetch(
+        bot, source_chat_id, source_msg_id, target_chat_id,
+        tmdb_api_key=tmdb_api_key, omdb_api_key=omdb_api_key, api_timeout=api_timeout,
+        http=http, db=db, banned=banned,
+    ))
+
+
+async def _take_prefetched(source_chat_id: int | str, source_msg_id: int) -> Any:
+    """
+    The _describe() result prefetched for a message, which may be None (no
+    media) or _BLOCKED, else _NOT_PREFETCHED.
+    """
+    task = _prefetched.pop((source_chat_id, source_msg_id), None)
+    if task is None:
+        return _NOT_PREFETCHED
+    try:
+        return await task
+    except Exception:
+        return _NOT_PREFETCHED
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Main publisher coroutine
+# ─────────────────────────────────────────────────────────────────────────────
+
+async def publish_message(
+    *,
+    bot: Bot,
+    source_chat_id: int,
+    source_msg_id: int,
+    target_chat_id: int,
+    tmdb_api_key: str = "",
+    omdb_api_key: str = "",
+    api_timeout: int = 10,
+    channel_username: str = "@YourChannel",
+    channel_link: str = "https://t.me/YourChannel",
+    custom_tag: str = "",
+    extra_tags: list[str] | None = None,
+    banned: re.Pattern[str] | None = None,
+    db: Database | None = None,
+    http: aiohttp.ClientSession | None = None,
+) -> bool:
+    """
+    Forward one media message from source → target with a rich caption.
+    Messages whose caption or filename contains a *banned* keyword are
+    dropped (and count as done).  Returns True on success, False on
+    failure.  Transient errors (see is_transient) are raised instead so the
+    caller can retry this message.
+    """
+    if db is not None and db.was_posted(source_chat_id, source_msg_id):
+        return True
+
+    described = await _take_prefetched(source_chat_id, source_msg_id)
+    if described is _NOT_PREFETCHED:
+        # ── 1. Fetch the source message by forwarding temporarily ──
+        await _throttle(target_chat_id)
         try:
-            sent_msg = await bot.copy_message(
+            temp_msg: Message = await bot.forward_message(
                 chat_id=target_chat_id,
                 from_chat_id=source_chat_id,
                 message_id=source_msg_id,
-                caption=caption,
-                parse_mode=ParseMode.HTML,
+                disable_notification=True,
             )
-        except TelegramError as exc2:
-            logger.critical("Both send methods failed: %s", exc2)
-            return False
+        except TelegramError as exc:
+            if is_transient(exc):
+                raise
+            logger.warning(
+                "Could not forward msg %d from %s: %s — skipping or trying fallback",
+                source_msg_id, source_chat_id, exc
+            )
+            # Attempt simple copy_message if forward fails (no rich metadata)
+            await _throttle(target_chat_id)
+            try:
+                sent = await bot.copy_message(
+                    chat_id=target_chat_id,
+                    from_chat_id=source_chat_id,
+                    message_id=source_msg_id,
+                    parse_mode=ParseMode.HTML,
+                )
+                if db:
+                    db.log_post(source_chat_id, source_msg_id, target_chat_id, sent.message_id)
+                return True
+            except TelegramError as exc2:
+                if is_transient(exc2):
+                    raise
+                logger.error("copy_message also failed for msg %d: %s", source_msg_id, exc2)
+                return False
+
+        # ── 2–4. Delete the temp forward while media info, guessit and
+        #         metadata are worked out from it ──
+        delete_task = asyncio.create_task(_delete_quietly(temp_msg))
+        try:
+            described = await _describe(
+                temp_msg,
+                tmdb_api_key=tmdb_api_key,
+                omdb_api_key=omdb_api_key,
+                api_timeout=api_timeout,
+                http=http,
+                db=db,
+                banned=banned,
+            )
+        finally:
+            await delete_task
 
-    if db and sent_msg:
-        db.log_post(source_chat_id, source_msg_id, target_chat_id, sent_msg.message_id, filename)
+    if described is None or described is _BLOCKED:
+        # Not a media msg, or filtered out — nothing to publish.
+        return True
 
-    return True
+    return await _publish_described(
+        bot,
+        described,
+        source_chat_id=source_chat_id,
+        source_msg_id=source_msg_id,
+        target_chat_id=target_chat_id,
+        channel_username=channel_username,
+        channel_link=channel_link,
+        custom_tag=custom_tag,
+        extra_tags=extra_tags,
+        banned=banned,
+        db=db,
+    )
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -235,37 +467,70 @@ async def publish_media_message(
     custom_tag: str = "",
     extra_tags: list[str] | None = None,
     db: Database | None = None,
+    http: aiohttp.ClientSession | None = None,
 ) -> bool:
     """
     Publish using the actual Message object (available in real-time webhook/polling).
     This is the PREFERRED path — gives us full file_id, filename, size.
     """
-    media_info = _extract_media(msg)
-    if not media_info:
+    described = await _describe(
+        msg,
+        tmdb_api_key=tmdb_api_key,
+        omdb_api_key=omdb_api_key,
+        api_timeout=api_timeout,
+        http=http,
+        db=db,
+    )
+    if described is None:
         return False
 
-    file_id, filename, file_size, media_kind = media_info
-    logger.info("Publishing '%s' (kind=%s) → %d", filename, media_kind, target_chat_id)
+    return await _publish_described(
+        bot,
+        described,
+        source_chat_id=msg.chat_id,
+        source_msg_id=msg.message_id,
+        target_chat_id=target_chat_id,
+        channel_username=channel_username,
+        channel_link=channel_link,
+        custom_tag=custom_tag,
+        extra_tags=extra_tags,
+        db=db,
+    )
 
-    # ── Metadata ─────────────────────────────────────────────────────────────
-    cleaned   = pre_clean_filename(filename)
-    try:
-        guess: dict[str, Any] = dict(guessit.guessit(cleaned))
-    except Exception:
-        guess = {}
 
-    raw_title  = str(guess.get("title") or Path(filename).stem)
-    raw_year   = int(guess.get("year")) if guess.get("year") else None
-    ctype      = detect_content_type(filename, guess)
+# ─────────────────────────────────────────────────────────────────────────────
+# Shared core  –  caption + send for an already described message
+# ─────────────────────────────────────────────────────────────────────────────
 
-    meta = await fetch_smart_metadata(
-        title=raw_title,
-        year=raw_year,
-        content_type=ctype,
-        tmdb_api_key=tmdb_api_key,
-        omdb_api_key=omdb_api_key,
-        timeout=api_timeout,
-    )
+async def _publish_described(
+    bot: Bot,
+    described: tuple,
+    *,
+    source_chat_id: int,
+    source_msg_id: int,
+    target_chat_id: int,
+    channel_username: str,
+    channel_link: str,
+    custom_tag: str,
+    extra_tags: list[str] | None,
+    banned: re.Pattern[str] | None = None,
+    db: Database | None = None,
+) -> bool:
+    """
+    Caption and send a _describe() result, falling back to copy_message.
+    Returns True when done (sent or filtered out), False if both sends
+    failed; transient errors are raised.
+    """
+    file_id, filename, file_size, media_kind, ctype, guess, meta, search = described
+
+    # _describe() already filtered, but a prefetched description predates
+    # any filter added since
+    word = blocked_by(search, banned)
+    if word is not None:
+        logger.info("msg_id %d blocked by filter: '%s'", source_msg_id, word)
+        return True
+
+    logger.info("Publishing '%s' (kind=%s) → %s", filename, media_kind, target_chat_id)
 
     caption = build_caption(
         content_type=ctype,
@@ -276,43 +541,34 @@ async def publish_media_message(
         channel_link=channel_link,
         custom_tag=custom_tag,
         extra_tags=extra_tags,
-    )[:1024]
+    )
 
     # ── Send (zero download — file_id only) ───────────────────────────────────
-    send_kwargs: dict[str, Any] = {
-        "chat_id":      target_chat_id,
-        "caption":      caption,
-        "parse_mode":   ParseMode.HTML,
-    }
-
     sent_msg: Message | None = None
+    await _throttle(target_chat_id)
     try:
-        if media_kind == "video":
-            sent_msg = await bot.send_video(video=file_id, **send_kwargs)
-        elif media_kind == "audio":
-            sent_msg = await bot.send_audio(audio=file_id, **send_kwargs)
-        elif media_kind == "animation":
-            sent_msg = await bot.send_animation(animation=file_id, **send_kwargs)
-        else:
-            sent_msg = await bot.send_document(document=file_id, **send_kwargs)
-
-        logger.info("✅ Posted '%s' → msg_id %s", filename, sent_msg.message_id if sent_msg else "?")
-
+        sent_msg = await _send_media(bot, media_kind, target_chat_id, file_id, caption)
     except TelegramError as exc:
+        if is_transient(exc):
+            raise
         logger.error("Primary send failed for '%s': %s — falling back to copy_message", filename, exc)
+        await _throttle(target_chat_id)
         try:
             sent_msg = await bot.copy_message(
                 chat_id=target_chat_id,
-                from_chat_id=msg.chat_id,
-                message_id=msg.message_id,
+                from_chat_id=source_chat_id,
+                message_id=source_msg_id,
                 caption=caption,
                 parse_mode=ParseMode.HTML,
             )
         except TelegramError as exc2:
+            if is_transient(exc2):
+                raise
             logger.critical("Both send methods failed for '%s': %s", filename, exc2)
             return False
 
-    if db and sent_msg:
-        db.log_post(msg.chat_id, msg.message_id, target_chat_id, sent_msg.message_id, filename)
+    logger.info("✅ Posted '%s' → msg_id %s", filename, sent_msg.message_id)
+    if db:
+        db.log_post(source_chat_id, source_msg_id, target_chat_id, sent_msg.message_id, filename)
 
     return True
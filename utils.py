@@ -17,54 +17,76 @@ Tier  API          Key?  Endpoint base
 
 from __future__ import annotations
 
+import asyncio
 import html as html_module
+import json
 import logging
 import re
-from pathlib import Path
+import time
+from collections import OrderedDict
+from functools import wraps
 from typing import Any
 
 import aiohttp
 
+try:
+    from orjson import loads as _json_loads     # optional: several times faster on big TMDB payloads
+except ImportError:
+    _json_loads = json.loads
+
 logger = logging.getLogger(__name__)
 
 # ─────────────────────────────────────────────────────────────────────────────
 # format_size
 # ─────────────────────────────────────────────────────────────────────────────
 
+_SIZE_UNITS = ("B", "KB", "MB", "GB", "TB", "PB")
+
+
 def format_size(size_bytes: int | None) -> str:
     if not size_bytes:
         return "N/A"
-    for unit in ("B", "KB", "MB", "GB", "TB"):
-        if abs(size_bytes) < 1024.0:
-            return f"{size_bytes:.2f} {unit}"
-        size_bytes /= 1024.0
-    return f"{size_bytes:.2f} PB"
+    # Every unit is 2**10 of the previous one, so the bit length picks it
+    idx = max(0, (abs(int(size_bytes)).bit_length() - 1) // 10)
+    idx = min(idx, len(_SIZE_UNITS) - 1)
+    return f"{size_bytes / (1 << (idx * 10)):.2f} {_SIZE_UNITS[idx]}"
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # pre_clean_filename
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Each pass replaces its matches with a space.  The last one covers every
+# release tag plus the . - _ separators: tags start with a letter or digit,
+# so a left-to-right scan always reaches a tag before its inner separators.
 _NOISE = [
     re.compile(r"www\.\S+", re.I),
     re.compile(r"\[.*?\]"),
     re.compile(r"\{.*?\}"),
-    re.compile(r"\b(mkv|mp4|avi|mov|flv|wmv|webm|m4v)\b", re.I),
     re.compile(
-        r"\b(HDTV|WEB-?DL|WEB-?RIP|BluRay|BRRip|DVDRip|HDRip|"
-        r"AMZN|NF|DSNP|HULU|HBO|PCOK|ATVP|DSNP|STAN|iT)\b", re.I),
-    re.compile(r"\bDD\+?\d\.\d\b", re.I),
-    re.compile(r"\b(x264|x265|HEVC|H\.?264|H\.?265|AVC|AAC|DDP?5\.1)\b", re.I),
-    re.compile(r"\b(10bit|HDR|SDR|DoVi|Atmos|DTS)\b", re.I),
-    re.compile(r"[\-_\.]{2,}"),
+        r"\b(?:mkv|mp4|avi|mov|flv|wmv|webm|m4v"
+        r"|HDTV|WEB-?DL|WEB-?RIP|BluRay|BRRip|DVDRip|HDRip"
+        r"|AMZN|NF|DSNP|HULU|HBO|PCOK|ATVP|STAN|iT"
+        r"|DD\+?\d\.\d"
+        r"|x264|x265|HEVC|H\.?264|H\.?265|AVC|AAC|DDP?5\.1"
+        r"|10bit|HDR|SDR|DoVi|Atmos|DTS)\b"
+        r"|[\-_\.]+",
+        re.I,
+    ),
 ]
 
 
+def file_stem(filename: str) -> str:
+    """Path(filename).stem by plain string slicing, without building a Path."""
+    name = filename.rpartition("/")[2]
+    dot  = name.rfind(".")
+    return name[:dot] if 0 < dot < len(name) - 1 else name
+
+
 def pre_clean_filename(filename: str) -> str:
-    name = Path(filename).stem
+    name = file_stem(filename)
     for p in _NOISE:
         name = p.sub(" ", name)
-    name = re.sub(r"[\.\-_]", " ", name)
     return " ".join(name.split())
 
 
@@ -94,6 +116,18 @@ _LANG_MAP: dict[str, str] = {
 }
 
 
+_ENGLISH = _LANG_MAP["en"]
+
+
+def _lang_label(item: Any) -> str:
+    """Label for one guessit language; region subtags (pt-BR, en-US) fall back to the base language."""
+    token = str(item).lower().strip()
+    label = _LANG_MAP.get(token)
+    if label is None:
+        label = _LANG_MAP.get(token.partition("-")[0]) or str(item).capitalize()
+    return label
+
+
 def detect_languages(guess: dict[str, Any]) -> str:
     raw: list[Any] = []
     for k in ("language", "audio_language"):
@@ -101,15 +135,14 @@ def detect_languages(guess: dict[str, Any]) -> str:
         if v is None:
             continue
         raw.extend(v if isinstance(v, list) else [v])
+    # No language, or a single one, is by far the most common case
+    if not raw:
+        return _ENGLISH
+    if len(raw) == 1:
+        return _lang_label(raw[0])
 
-    seen, added = [], set()
-    for item in raw:
-        token = str(item).lower().strip()
-        label = _LANG_MAP.get(token, str(item).capitalize())
-        if label not in added:
-            seen.append(label)
-            added.add(label)
-    return ", ".join(seen) if seen else "🇬🇧 English"
+    # dict.fromkeys: de-duplicated labels, first occurrence order
+    return ", ".join(dict.fromkeys(map(_lang_label, raw)))
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -128,18 +161,72 @@ _SIZE_MAP = {
 }
 
 
+_SIZE_RE    = re.compile("|".join(_SIZE_MAP))
+_SIZE_ORDER = {token: rank for rank, token in enumerate(_SIZE_MAP)}
+
+
 def resolution_from_guess(guess: dict[str, Any]) -> str:
     raw = str(guess.get("screen_size", "")).lower()
-    for token, label in _SIZE_MAP.items():
-        if token in raw:
-            return label
+    found = _SIZE_RE.findall(raw)
+    if found:
+        # The highest resolution named anywhere wins, not the leftmost
+        return _SIZE_MAP[min(found, key=_SIZE_ORDER.__getitem__)]
     return raw.upper() if raw else "N/A"
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# Circuit breakers  –  stop waiting on an API host that keeps failing
+# ─────────────────────────────────────────────────────────────────────────────
+
+_BREAKER_THRESHOLD = 5     # consecutive failures that open a host's breaker
+_BREAKER_COOLDOWN  = 60    # seconds an open breaker skips the host
+
+
+class _Breaker:
+    """
+    Consecutive-failure count for one API host.  Once open, calls are
+    skipped for _BREAKER_COOLDOWN seconds; the next call after that is a
+    trial that closes it on success or re-opens it on failure.
+    """
+
+    __slots__ = ("failures", "opened_at")
+
+    def __init__(self) -> None:
+        self.failures  = 0
+        self.opened_at = 0.0
+
+    def allow(self) -> bool:
+        return (
+            self.failures < _BREAKER_THRESHOLD
+            or time.monotonic() - self.opened_at >= _BREAKER_COOLDOWN
+        )
+
+    def record(self, ok: bool) -> None:
+        if ok:
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.failures >= _BREAKER_THRESHOLD:
+            self.opened_at = time.monotonic()
+
+
+_breakers: dict[str, _Breaker] = {}
+
+
+def _breaker_for(url: str) -> _Breaker:
+    host = url.split("/", 3)[2]
+    breaker = _breakers.get(host)
+    if breaker is None:
+        breaker = _breakers[host] = _Breaker()
+    return breaker
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # Low-level HTTP helper
 # ─────────────────────────────────────────────────────────────────────────────
 
+_CONNECT_TIMEOUT = 2    # seconds; an unreachable host should not eat the whole budget
+
 async def _get(
     session: aiohttp.ClientSession,
     url: str,
@@ -147,16 +234,22 @@ async def _get(
     headers: dict | None = None,
     timeout: int = 10,
 ) -> dict[str, Any] | None:
+    breaker = _breaker_for(url)
+    if not breaker.allow():
+        return None
     try:
         async with session.get(
             url,
             params=params,
             headers=headers,
-            timeout=aiohttp.ClientTimeout(total=timeout),
+            timeout=aiohttp.ClientTimeout(total=timeout, sock_connect=_CONNECT_TIMEOUT),
         ) as resp:
+            # 4xx other than 429 is an answer (e.g. "not found"), not an outage
+            breaker.record(resp.status < 500 and resp.status != 429)
             if resp.status == 200:
-                return await resp.json(content_type=None)
+                return await resp.json(content_type=None, loads=_json_loads)
     except Exception as exc:
+        breaker.record(False)
         logger.debug("GET %s failed: %s", url, exc)
     return None
 
@@ -167,42 +260,110 @@ async def _post_json(
     payload: dict,
     timeout: int = 10,
 ) -> dict[str, Any] | None:
+    breaker = _breaker_for(url)
+    if not breaker.allow():
+        return None
     try:
         async with session.post(
             url,
             json=payload,
-            timeout=aiohttp.ClientTimeout(total=timeout),
+            timeout=aiohttp.ClientTimeout(total=timeout, sock_connect=_CONNECT_TIMEOUT),
         ) as resp:
+            breaker.record(resp.status < 500 and resp.status != 429)
             if resp.status == 200:
-                return await resp.json(content_type=None)
+                return await resp.json(content_type=None, loads=_json_loads)
     except Exception as exc:
+        breaker.record(False)
         logger.debug("POST %s failed: %s", url, exc)
     return None
 
 
+def _dig(d: Any, *keys: str, default: Any = None) -> Any:
+    """d[k1][k2]… through nested JSON objects; *default* if a level is missing, null or not an object."""
+    for key in keys:
+        if not isinstance(d, dict):
+            return default
+        d = d.get(key)
+        if d is None:
+            return default
+    return d
+
+
+_NO_SYNOPSIS = "No synopsis available."
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Lookup memo  –  consecutive posts are usually the same show / season
+# ─────────────────────────────────────────────────────────────────────────────
+
+_LOOKUP_MAX   = 512    # entries per provider
+_NEGATIVE_TTL = 600    # seconds a "not found" is trusted
+
+
+def _memo_lookup(fn):
+    """
+    Bounded LRU around a provider lookup, keyed on the normalised title plus
+    the remaining positional args (the session is ignored).  Hits are kept
+    until evicted; misses are retried after _NEGATIVE_TTL.  Concurrent calls
+    for the same key share one in-flight request.
+    """
+    cache:    OrderedDict[tuple, tuple[float, dict | None]] = OrderedDict()
+    inflight: dict[tuple, asyncio.Future] = {}
+
+    @wraps(fn)
+    async def wrapper(session: aiohttp.ClientSession, title: str, *args: Any) -> dict | None:
+        key = (" ".join(title.casefold().split()), *args)
+        hit = cache.get(key)
+        if hit is not None:
+            stored_at, result = hit
+            if result is not None or time.monotonic() - stored_at < _NEGATIVE_TTL:
+                cache.move_to_end(key)
+                return result
+        pending = inflight.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        pending = inflight[key] = asyncio.ensure_future(fn(session, title, *args))
+        try:
+            result = await asyncio.shield(pending)
+        finally:
+            inflight.pop(key, None)
+        cache[key] = (time.monotonic(), result)
+        cache.move_to_end(key)
+        if len(cache) > _LOOKUP_MAX:
+            cache.popitem(last=False)
+        return result
+
+    return wrapper
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # ① TVMaze  (NO KEY REQUIRED)
 #    https://api.tvmaze.com/singlesearch/shows?q=<title>
 # ─────────────────────────────────────────────────────────────────────────────
 
+_HTML_TAG_RE = re.compile(r"<[^>]+>")   # TVMaze summaries are HTML
+
+
 async def _tvmaze(session: aiohttp.ClientSession, title: str, timeout: int) -> dict | None:
     data = await _get(session, "https://api.tvmaze.com/singlesearch/shows",
                       params={"q": title}, timeout=timeout)
     if not data:
         return None
     genres = data.get("genres", [])
-    summary = html_module.unescape(re.sub(r"<[^>]+>", "", data.get("summary") or ""))
+    summary = _HTML_TAG_RE.sub("", data.get("summary") or "")
+    if "&" in summary:                 # most summaries carry no entities
+        summary = html_module.unescape(summary)
     return {
         "title":    data.get("name", "Unknown"),
         "year":     str(data.get("premiered") or "")[:4],
-        "rating":   str(data.get("rating", {}).get("average") or "N/A"),
+        "rating":   str(_dig(data, "rating", "average") or "N/A"),
         "genres":   ", ".join(genres) if genres else "N/A",
-        "overview": summary or "No synopsis available.",
+        "overview": summary or _NO_SYNOPSIS,
         "director": "N/A",
         "cast":     "N/A",
         "runtime":  f"{data.get('averageRuntime', 'N/A')} min",
         "language": data.get("language", "N/A"),
-        "country":  (data.get("network") or {}).get("country", {}).get("name", "N/A"),
+        "country":  _dig(data, "network", "country", "name", default="N/A"),
         "source":   "TVMaze",
     }
 
@@ -225,10 +386,10 @@ async def _jikan(session: aiohttp.ClientSession, title: str, timeout: int) -> di
     studios  = [s["name"] for s in d.get("studios", [])]
     return {
         "title":    d.get("title_english") or d.get("title", "Unknown"),
-        "year":     str(d.get("aired", {}).get("from") or "")[:4],
+        "year":     str(_dig(d, "aired", "from") or "")[:4],
         "rating":   str(d.get("score", "N/A")),
         "genres":   ", ".join(genres) if genres else "N/A",
-        "overview": (d.get("synopsis") or "No synopsis available."),
+        "overview": d.get("synopsis") or _NO_SYNOPSIS,
         "director": ", ".join(studios) if studios else "N/A",
         "cast":     "N/A",
         "runtime":  str(d.get("duration", "N/A")),
@@ -262,9 +423,9 @@ async def _kitsu(session: aiohttp.ClientSession, title: str, timeout: int) -> di
         for c in data.get("included", [])
         if c.get("type") == "categories"
     ]
-    synopsis = a.get("synopsis") or a.get("description") or "No synopsis available."
+    synopsis = a.get("synopsis") or a.get("description") or _NO_SYNOPSIS
     return {
-        "title":    a.get("titles", {}).get("en_jp") or a.get("canonicalTitle", "Unknown"),
+        "title":    _dig(a, "titles", "en_jp") or a.get("canonicalTitle", "Unknown"),
         "year":     str(a.get("startDate") or "")[:4],
         "rating":   str(a.get("averageRating") or "N/A"),
         "genres":   ", ".join(cats[:4]) if cats else "N/A",
@@ -308,16 +469,16 @@ async def _anilist(session: aiohttp.ClientSession, title: str, timeout: int) ->
     )
     if not data:
         return None
-    media = (data.get("data") or {}).get("Media")
+    media = _dig(data, "data", "Media")
     if not media:
         return None
-    t        = media.get("title", {})
-    studios  = [n["name"] for n in (media.get("studios") or {}).get("nodes", [])]
+    t        = media.get("title") or {}
+    studios  = [n["name"] for n in _dig(media, "studios", "nodes", default=())]
     genres   = media.get("genres", [])
-    desc     = (media.get("description") or "No synopsis available.").replace("\n", " ")
+    desc     = (media.get("description") or _NO_SYNOPSIS).replace("\n", " ")
     return {
         "title":    t.get("english") or t.get("romaji", "Unknown"),
-        "year":     str((media.get("startDate") or {}).get("year") or "N/A"),
+        "year":     str(_dig(media, "startDate", "year") or "N/A"),
         "rating":   str((media.get("averageScore") or "N/A")),
         "genres":   ", ".join(genres[:4]) if genres else "N/A",
         "overview": desc,
@@ -335,6 +496,7 @@ async def _anilist(session: aiohttp.ClientSession, title: str, timeout: int) ->
 #    https://api.themoviedb.org/3/search/multi?api_key=…&query=…
 # ─────────────────────────────────────────────────────────────────────────────
 
+@_memo_lookup
 async def _tmdb(
     session: aiohttp.ClientSession,
     title: str,
@@ -372,16 +534,16 @@ async def _tmdb(
         detail = search["results"][0]
 
     if media_type == "movie":
-        crew      = detail.get("credits", {}).get("crew", [])
+        crew      = _dig(detail, "credits", "crew", default=())
         directors = [p["name"] for p in crew if p.get("job") == "Director"]
-        cast      = [p["name"] for p in detail.get("credits", {}).get("cast", [])[:5]]
+        cast      = [p["name"] for p in _dig(detail, "credits", "cast", default=())[:5]]
         genres    = [g["name"] for g in detail.get("genres", [])]
         return {
             "title":    detail.get("title") or detail.get("original_title", "Unknown"),
             "year":     str(detail.get("release_date") or "")[:4],
             "rating":   str(detail.get("vote_average", "N/A")),
             "genres":   ", ".join(genres) if genres else "N/A",
-            "overview": detail.get("overview") or "No synopsis available.",
+            "overview": detail.get("overview") or _NO_SYNOPSIS,
             "director": ", ".join(directors) if directors else "N/A",
             "cast":     ", ".join(cast) if cast else "N/A",
             "runtime":  f"{detail.get('runtime', 'N/A')} min",
@@ -390,7 +552,7 @@ async def _tmdb(
             "source":   "TMDB",
         }
     else:
-        cast   = [p["name"] for p in detail.get("credits", {}).get("cast", [])[:5]]
+        cast   = [p["name"] for p in _dig(detail, "credits", "cast", default=())[:5]]
         genres = [g["name"] for g in detail.get("genres", [])]
         runtime = (detail.get("episode_run_time") or [None])[0]
         return {
@@ -398,7 +560,7 @@ async def _tmdb(
             "year":     str(detail.get("first_air_date") or "")[:4],
             "rating":   str(detail.get("vote_average", "N/A")),
             "genres":   ", ".join(genres) if genres else "N/A",
-            "overview": detail.get("overview") or "No synopsis available.",
+            "overview": detail.get("overview") or _NO_SYNOPSIS,
             "director": "N/A",
             "cast":     ", ".join(cast) if cast else "N/A",
             "runtime":  f"{runtime or 'N/A'} min",
@@ -413,6 +575,7 @@ async def _tmdb(
 #    http://www.omdbapi.com/?apikey=…&t=…
 # ─────────────────────────────────────────────────────────────────────────────
 
+@_memo_lookup
 async def _omdb(
     session: aiohttp.ClientSession,
     title: str,
@@ -433,7 +596,7 @@ async def _omdb(
         "year":     str(data.get("Year", "N/A"))[:4],
         "rating":   data.get("imdbRating", "N/A"),
         "genres":   data.get("Genre", "N/A"),
-        "overview": data.get("Plot", "No synopsis available."),
+        "overview": data.get("Plot", _NO_SYNOPSIS),
         "director": data.get("Director", "N/A"),
         "cast":     data.get("Actors", "N/A"),
         "runtime":  data.get("Runtime", "N/A"),
@@ -452,7 +615,7 @@ _DEFAULT: dict[str, Any] = {
     "year":     "N/A",
     "rating":   "N/A",
     "genres":   "N/A",
-    "overview": "No synopsis available.",
+    "overview": _NO_SYNOPSIS,
     "director": "N/A",
     "cast":     "N/A",
     "runtime":  "N/A",
@@ -462,6 +625,74 @@ _DEFAULT: dict[str, Any] = {
 }
 
 
+# Per-provider ceilings on the caller's timeout; all of them normally answer
+# in well under a second, and Jikan (a MAL scraper) is the slowest
+_PROVIDER_TIMEOUTS: dict[str, int] = {
+    "tvmaze":  3,
+    "jikan":   6,
+    "kitsu":   4,
+    "anilist": 4,
+    "tmdb":    5,
+    "omdb":    5,
+}
+
+
+# Provider name → (provider, timeout ceiling, argument shape), the shape
+# being "title" for the keyless APIs, "omdb", or the TMDB media type
+_PROVIDERS: dict[str, tuple] = {
+    "tvmaze":     (_tvmaze,  _PROVIDER_TIMEOUTS["tvmaze"],  "title"),
+    "jikan":      (_jikan,   _PROVIDER_TIMEOUTS["jikan"],   "title"),
+    "kitsu":      (_kitsu,   _PROVIDER_TIMEOUTS["kitsu"],   "title"),
+    "anilist":    (_anilist, _PROVIDER_TIMEOUTS["anilist"], "title"),
+    "tmdb_tv":    (_tmdb,    _PROVIDER_TIMEOUTS["tmdb"],    "tv"),
+    "tmdb_movie": (_tmdb,    _PROVIDER_TIMEOUTS["tmdb"],    "movie"),
+    "omdb":       (_omdb,    _PROVIDER_TIMEOUTS["omdb"],    "omdb"),
+}
+
+
+def _plan(*tiers: tuple[str, ...]) -> tuple[tuple[tuple, ...], ...]:
+    """Resolve tiers of provider names to their _PROVIDERS entries."""
+    return tuple(tuple(_PROVIDERS[name] for name in tier) for tier in tiers)
+
+
+# Content type → tiers of providers in priority order; unknown types use
+# "_movie".  TMDB and OMDb get a tier each so OMDb's daily quota is only
+# spent on a TMDB miss.
+_TV_PLAN = _plan(("tvmaze",), ("tmdb_tv",), ("omdb",))
+_PLAN: dict[str, tuple[tuple[tuple, ...], ...]] = {
+    "anime":   _plan(("jikan", "anilist", "kitsu"), ("tmdb_tv", "tvmaze")),
+    "kdrama":  _TV_PLAN,
+    "cdrama":  _TV_PLAN,
+    "jdrama":  _TV_PLAN,
+    "series":  _TV_PLAN,
+    "episode": _TV_PLAN,
+    "_movie":  _plan(("tvmaze",), ("tmdb_movie",), ("omdb",)),
+}
+
+
+async def _first_found(session: aiohttp.ClientSession, tier: list[tuple]) -> dict | None:
+    """
+    Start every lookup in *tier*, each a (provider, *args after the session)
+    tuple, at once and return the first non-empty result in priority order,
+    cancelling the rest as soon as it is known.  Total time is the slowest
+    provider up to the winner, not the sum of them all.
+    """
+    tasks = [asyncio.ensure_future(fn(session, *args)) for fn, *args in tier]
+    try:
+        for task in tasks:
+            try:
+                result = await task
+            except Exception as exc:
+                logger.warning("Metadata provider crashed: %s", exc)
+                continue
+            if result:
+                return result
+        return None
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
 async def fetch_smart_metadata(
     title: str,
     year: int | None,
@@ -469,9 +700,15 @@ async def fetch_smart_metadata(
     tmdb_api_key: str = "",
     omdb_api_key: str = "",
     timeout: int = 10,
+    session: aiohttp.ClientSession | None = None,
 ) -> dict[str, Any]:
     """
-    Cascade through all 6 APIs; return the first successful result.
+    Query the APIs for *content_type* in tiers: the providers of a tier run
+    concurrently, and the next tier is only tried if none of them found the
+    title, so TMDB / OMDb quota is spent only after the keyless APIs miss.
+    The result of the highest-priority provider that answered wins.
+    Pass a long-lived *session* to reuse its connection pool; without one a
+    throwaway session is opened for this call.
 
     Content-type routing
     ────────────────────
@@ -480,48 +717,26 @@ async def fetch_smart_metadata(
     jdrama/series  → TVMaze → TMDB-TV → OMDb
     movie / rest   → TVMaze → TMDB-Movie → OMDb
     """
-    is_anime = content_type == "anime"
-    is_tv    = content_type in ("kdrama", "cdrama", "jdrama", "series", "episode")
-
-    async with aiohttp.ClientSession() as session:
-        try:
-            if is_anime:
-                for fn in (
-                    lambda: _jikan(session, title, timeout),
-                    lambda: _anilist(session, title, timeout),
-                    lambda: _kitsu(session, title, timeout),
-                    lambda: _tmdb(session, title, year, tmdb_api_key, "tv", timeout),
-                    lambda: _tvmaze(session, title, timeout),
-                ):
-                    result = await fn()
-                    if result:
-                        logger.info("Metadata for '%s' from %s", title, result["source"])
-                        return result
-
-            elif is_tv:
-                for fn in (
-                    lambda: _tvmaze(session, title, timeout),
-                    lambda: _tmdb(session, title, year, tmdb_api_key, "tv", timeout),
-                    lambda: _omdb(session, title, year, omdb_api_key, timeout),
-                ):
-                    result = await fn()
-                    if result:
-                        logger.info("Metadata for '%s' from %s", title, result["source"])
-                        return result
-
+    if session is None:
+        async with aiohttp.ClientSession() as own:
+            return await fetch_smart_metadata(
+                title, year, content_type, tmdb_api_key, omdb_api_key, timeout, session=own,
+            )
+
+    for tier in _PLAN.get(content_type, _PLAN["_movie"]):
+        lookups = []
+        for fn, cap, shape in tier:
+            t = min(timeout, cap)
+            if shape == "title":
+                lookups.append((fn, title, t))
+            elif shape == "omdb":
+                lookups.append((fn, title, year, omdb_api_key, t))
             else:
-                for fn in (
-                    lambda: _tvmaze(session, title, timeout),
-                    lambda: _tmdb(session, title, year, tmdb_api_key, "movie", timeout),
-                    lambda: _omdb(session, title, year, omdb_api_key, timeout),
-                ):
-                    result = await fn()
-                    if result:
-                        logger.info("Metadata for '%s' from %s", title, result["source"])
-                        return result
-
-        except Exception as exc:
-            logger.warning("fetch_smart_metadata crash for '%s': %s", title, exc)
+                lookups.append((fn, title, year, tmdb_api_key, shape, t))
+        result = await _first_found(session, lookups)
+        if result:
+            logger.info("Metadata for '%s' from %s", title, result["source"])
+            return result
 
     logger.info("No metadata found for '%s'; using defaults.", title)
     return {**_DEFAULT, "title": title or "Unknown"}
\ No newline at end of file